@@ -0,0 +1,49 @@
+import subprocess
+import sys
+import json
+
+HEAVY_MODULES = ("matplotlib", "scipy", "pandas")
+
+
+def import_profile(module: "str" = "seeldlm") -> "dict":
+
+    # -- A fresh interpreter so nothing is already cached in sys.modules
+    script = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - start\n"
+        "loaded = sorted({name.split('.')[0] for name in sys.modules})\n"
+        "print(json.dumps({'seconds': elapsed, 'modules': loaded}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+
+    return json.loads(output.stdout)
+
+
+def import_benchmark(
+    module: "str" = "seeldlm", repeats: "int" = 5, budget: "float" = 0.5
+) -> "float":
+
+    profiles = [import_profile(module) for _ in range(repeats)]
+    seconds = min(profile["seconds"] for profile in profiles)
+
+    heavy = [name for name in HEAVY_MODULES if name in profiles[0]["modules"]]
+    if len(heavy) > 0:
+        raise BaseException(f"import {module} loaded heavy modules {heavy}")
+
+    if seconds > budget:
+        raise BaseException(
+            f"import {module} took {seconds:.3f}s, over the {budget:.3f}s budget"
+        )
+
+    return seconds
+
+
+if __name__ == "__main__":
+
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+    seconds = import_benchmark(budget=budget)
+    print(f"import seeldlm: {seconds * 1000:.1f} ms")
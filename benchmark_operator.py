@@ -0,0 +1,100 @@
+import sys
+import timeit
+import numpy
+
+import seeldlm
+from seeldlm.objects.utils import transpose
+
+
+def harmonic_compiler(harmonics: "int") -> "seeldlm.ModelCompiler":
+
+    factory = seeldlm.ComponentFactory()
+    compiler = seeldlm.ModelCompiler(1)
+    compiler.add_component_sequence(
+        factory.polynomial(2), factory.harmonics(1, harmonics)
+    )
+    compiler.set_vertex(-1, 0, [0])
+    compiler.set_vertex(-1, 1, [0])
+
+    return compiler
+
+
+def propagation_benchmark(harmonics: "int", repeats: "int" = 200) -> "tuple":
+
+    compiler = harmonic_compiler(harmonics)
+    dense = compiler.compile_transition()
+    operator = compiler.compile_transition_operator()
+
+    root = numpy.random.default_rng(0).random(dense.shape)
+    covariance = root @ root.T
+
+    dense_time = (
+        timeit.timeit(lambda: dense @ covariance @ dense.T, number=repeats) / repeats
+    )
+    operator_time = (
+        timeit.timeit(
+            lambda: operator @ covariance @ transpose(operator), number=repeats
+        )
+        / repeats
+    )
+
+    return dense.shape[0], dense_time, operator_time
+
+
+def forward_benchmark(harmonics: "int", period: "int" = 200) -> "tuple":
+
+    compiler = harmonic_compiler(harmonics)
+    P = compiler.compile_transition().shape[0]
+    rng = numpy.random.default_rng(0)
+    observations = numpy.cumsum(rng.normal(size=(1, 1, period)), axis=-1)
+
+    timings = []
+    for weights in (
+        compiler.compile_transition(),
+        compiler.compile_transition_operator(),
+    ):
+        evolvers = seeldlm.TransitionContainer(0, 1)
+        evolvers.set_at_time(
+            0, seeldlm.TransitionModel(numpy.zeros((P, 1)), weights, numpy.eye(P))
+        )
+        observers = seeldlm.TransitionContainer(0, 1)
+        observers.set_at_time(
+            0,
+            seeldlm.TransitionModel(
+                numpy.zeros((1, 1)), compiler.compile_observation(), numpy.eye(1)
+            ),
+        )
+        prime_memory = seeldlm.PrimeMemoryDLM(
+            period,
+            0,
+            observations,
+            seeldlm.NormalModel(numpy.zeros((P, 1)), numpy.eye(P)),
+            seeldlm.InvWishartModel(numpy.eye(1), 1),
+            evolvers,
+            observers,
+        )
+        modeller = seeldlm.ModellerDLM(prime_memory, storage="tensor")
+        timings.append(timeit.timeit(modeller.forward, number=1))
+
+    return P, timings[0], timings[1]
+
+
+if __name__ == "__main__":
+
+    sizes = [int(size) for size in sys.argv[1:]] or [10, 50, 200]
+
+    print("A S A' per call (ms)")
+    for harmonics in sizes:
+        P, dense_time, operator_time = propagation_benchmark(harmonics)
+        print(
+            f"P={P:4d} dense={dense_time * 1e3:8.3f} operator={operator_time * 1e3:8.3f}"
+            f" ratio={operator_time / dense_time:6.2f}"
+        )
+
+    print("forward, 200 steps (s)")
+    for harmonics in sizes:
+        P, dense_time, operator_time = forward_benchmark(harmonics)
+        print(
+            f"P={P:4d} dense={dense_time:8.3f} operator={operator_time:8.3f}"
+            f" ratio={operator_time / dense_time:6.2f}"
+        )
@@ -1,7 +1,15 @@
-import pandas
-from typing import List
+import numpy
+from numpy.lib.format import open_memmap
+from numpy.typing import NDArray
+from typing import TYPE_CHECKING, List, Optional
+import hashlib
+import json
+import os
 import pathlib
 
+if TYPE_CHECKING:
+    import pandas
+
 
 def default_path():
 
@@ -13,6 +21,8 @@ def default_path():
 
 def weather_dataframe(csv_path: "str" = default_path()) -> "pandas.DataFrame":
 
+    import pandas
+
     # Load dataset as pandas DataFrame
     dataset: "pandas.DataFrame" = pandas.read_csv(csv_path)
 
@@ -46,6 +56,125 @@ def weather_dataframe(csv_path: "str" = default_path()) -> "pandas.DataFrame":
     return dataset
 
 
+def weather_columns(csv_path: "str") -> "List[str]":
+
+    import pandas
+
+    # Column names are given in the second row of the file
+    header: "pandas.DataFrame" = pandas.read_csv(
+        csv_path, header=None, nrows=2, dtype=str, keep_default_na=False
+    )
+
+    return header.iloc[1].to_list()
+
+
+def weather_cache_path(csv_path: "str", columns: "List[str]", dtype: "str") -> "str":
+
+    digest = hashlib.sha1(json.dumps([columns, dtype]).encode()).hexdigest()[:16]
+
+    return str(pathlib.Path(csv_path).with_suffix(f".{digest}.npy"))
+
+
+def weather_source_stamp(csv_path: "str") -> "dict":
+
+    stat = os.stat(csv_path)
+
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def weather_row_count(csv_path: "str", skiprows: "int") -> "int":
+
+    # Upper bound on data rows, since pandas drops blank lines
+    lines = 0
+    last = b"\n"
+    with open(csv_path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            lines += block.count(b"\n")
+            last = block[-1:]
+
+    if last != b"\n":
+        lines += 1
+
+    return max(lines - skiprows, 0)
+
+
+def weather_array(
+    columns: "List[str]",
+    csv_path: "str" = default_path(),
+    cache_path: "Optional[str]" = None,
+    dtype: "str" = "float64",
+    chunksize: "int" = 100_000,
+    memory_map: "bool" = True,
+) -> "NDArray":
+
+    if cache_path is None:
+        cache_path = weather_cache_path(csv_path, columns, dtype)
+    stamp_path = cache_path + ".json"
+
+    # Reuse the cached array while the source file is unchanged
+    stamp = weather_source_stamp(csv_path)
+    if os.path.exists(cache_path) and os.path.exists(stamp_path):
+        with open(stamp_path) as file:
+            if json.load(file) == stamp:
+                return numpy.load(cache_path, mmap_mode="r" if memory_map else None)
+
+    # Locate requested columns by their names in the second row
+    names = weather_columns(csv_path)
+    missing = [column for column in columns if not column in names]
+    if len(missing) > 0:
+        raise BaseException(f"Columns {missing} not found in {csv_path}")
+    positions = [names.index(column) for column in columns]
+
+    # Read only the requested columns, typed at read time, in chunks
+    import pandas
+
+    reader = pandas.read_csv(
+        csv_path,
+        header=None,
+        skiprows=2,
+        usecols=positions,
+        dtype={position: dtype for position in positions},
+        chunksize=chunksize,
+    )
+
+    # Stream chunks into a preallocated (M, N, T) file with a single subject;
+    # time-major order makes every chunk one contiguous write
+    rows = weather_row_count(csv_path, 2)
+    temporary_path = cache_path + ".tmp.npy"
+    array = open_memmap(
+        temporary_path, "w+", dtype, (len(columns), 1, rows), fortran_order=True
+    )
+
+    written = 0
+    for chunk in reader:
+        values = chunk[positions].to_numpy()
+        if written + len(values) > rows:
+            raise BaseException(f"{csv_path} has more rows than lines")
+        array[:, 0, written : written + len(values)] = values.T
+        written += len(values)
+
+    array.flush()
+    del array
+
+    # Blank lines were counted but never parsed, so trim the time axis
+    if written < rows:
+        source = numpy.load(temporary_path, mmap_mode="r")
+        trimmed_path = cache_path + ".trim.npy"
+        trimmed = open_memmap(
+            trimmed_path, "w+", dtype, (len(columns), 1, written), fortran_order=True
+        )
+        trimmed[...] = source[..., :written]
+        trimmed.flush()
+        del trimmed, source
+        os.replace(trimmed_path, temporary_path)
+
+    os.replace(temporary_path, cache_path)
+    with open(stamp_path, "w") as file:
+        json.dump(stamp, file)
+
+    return numpy.load(cache_path, mmap_mode="r" if memory_map else None)
+
+
 if __name__ == "__main__":
 
     print(default_path())
@@ -1,6 +1,32 @@
 from .memory import PrimeMemoryDLM
 from .funcs import ModellerDLM
+from .retention import RetentionDLM
+from .steady import SteadyStateDLM
+from .forecast import ForecastDLM
+from .stream import StreamDLM, FixedLagDLM
+from .fitter import FitterDLM
+from .search import SearchDLM
+from .intervals import IntervalDLM
+from .sampler import SamplerDLM
+from .scenario import ScenarioDLM
+from .backtest import BacktestDLM
 from .objects import NormalModel, TransitionModel, JointModel, InvWishartModel
-from .components import ComponentFactory, ModelCompiler
-from .containers import NormalContainer, TransitionContainer, InvWishartContainer
-from .visualiser import VisualDLM
+from .components import ComponentFactory, ModelCompiler, BlockOperator
+from .specification import ModelSpecification, ModelCache
+from .containers import (
+    NormalContainer,
+    TransitionContainer,
+    InvWishartContainer,
+    ContainerFactory,
+)
+
+
+# -- Plotting pulls in matplotlib, so it is only imported on first use
+def __getattr__(name: "str"):
+
+    if name in ("VisualDLM", "ExportDLM"):
+        from . import visualiser
+
+        return getattr(visualiser, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,151 @@
+from typing import Dict, Optional
+from numpy.typing import NDArray
+import math
+import numpy
+
+from .funcs import ModellerDLM
+from .forecast import ForecastDLM
+from .containers import t_quantile
+
+
+def log_beta(first: "float", second: "float") -> "float":
+    return math.lgamma(first) + math.lgamma(second) - math.lgamma(first + second)
+
+
+def student_t_crps(
+    observation: "NDArray", location: "NDArray", scale: "NDArray", shape: "float"
+) -> "NDArray":
+
+    from scipy.stats import t as gen_t
+
+    if shape <= 1:
+        raise BaseException(f"shape={shape} has to exceed 1 for a finite CRPS")
+
+    # -- Closed form CRPS of a location-scale Student t
+    z = (observation - location) / scale
+    constant = (
+        2
+        * math.sqrt(shape)
+        * math.exp(log_beta(0.5, shape - 0.5) - 2 * log_beta(0.5, shape / 2))
+        / (shape - 1)
+    )
+    crps = (
+        z * (2 * gen_t.cdf(z, shape) - 1)
+        + 2 * gen_t.pdf(z, shape) * (shape + z**2) / (shape - 1)
+        - constant
+    )
+
+    return scale * crps
+
+
+class BacktestDLM:
+    def __init__(
+        self,
+        modeller: "ModellerDLM",
+        horizon: "int",
+        every: "int" = 1,
+        significance_level: "float" = 0.05,
+        first: "Optional[int]" = None,
+    ):
+
+        if horizon < 1 or every < 1:
+            raise BaseException(
+                f"horizon={horizon} and every={every} have to be positive"
+            )
+
+        self.modeller = modeller
+        self.horizon = horizon
+        self.every = every
+        self.significance_level = significance_level
+        self.first = every if first is None else first
+        self.forecaster: "Optional[ForecastDLM]" = None
+
+        self.reset()
+
+    def reset(self):
+
+        # -- Running sums per horizon, reduced to metrics on demand
+        size = (self.horizon,) + self.modeller.prime_memory.observations.shape[:-1]
+        self.origins = 0
+        self.counts = numpy.zeros(size)
+        self.absolute = numpy.zeros(size)
+        self.crps = numpy.zeros(size)
+        self.covered = numpy.zeros(size)
+
+    def accumulate(
+        self,
+        step: "int",
+        observation: "NDArray",
+        mean: "NDArray",
+        scale: "NDArray",
+        shape: "float",
+    ):
+
+        mask = ~numpy.isnan(observation)
+        filled = numpy.where(mask, observation, mean)
+        error = numpy.abs(filled - mean)
+        width = t_quantile(1 - self.significance_level / 2, float(shape)) * scale
+
+        self.counts[step] += mask
+        self.absolute[step] += numpy.where(mask, error, 0)
+        self.crps[step] += numpy.where(
+            mask, student_t_crps(filled, mean, scale, float(shape)), 0
+        )
+        self.covered[step] += mask & (error <= width)
+
+    def observe(self, time: "int"):
+
+        observed_period = self.modeller.prime_memory.S
+        if time < self.first or (time - self.first) % self.every != 0:
+            return
+        if time >= observed_period:
+            return
+
+        memory = self.modeller.memory
+        state = memory.recall("filtered_states", time)
+        error = memory.recall("wisharts", time)
+
+        if self.forecaster is None:
+            self.forecaster = ForecastDLM(
+                state,
+                error,
+                self.modeller.prime_memory.evolvers.get_from_time(0),
+                self.modeller.prime_memory.observers.get_from_time(0),
+                memory.numerics,
+            )
+        forecaster = self.forecaster.reorigin(state, error)
+
+        observations = self.modeller.prime_memory.observations
+        column_variances = numpy.asarray(error.scale).diagonal(axis1=-2, axis2=-1)
+        self.origins += 1
+
+        for step in range(min(self.horizon, observed_period - time)):
+            space = forecaster.space_at(step + 1)
+            row_variances = space.covariance.diagonal(axis1=-2, axis2=-1)
+            variances = row_variances[..., :, None] * column_variances[..., None, :]
+            scale = numpy.sqrt(variances / error.shape)
+
+            observation = numpy.asarray(observations[..., time + step])
+            self.accumulate(step, observation, space.mean, scale, error.shape)
+
+    def run(self) -> "Dict[str, NDArray]":
+
+        self.reset()
+
+        self.modeller.forward(callback=self.observe)
+
+        return self.metrics()
+
+    def metrics(self) -> "Dict[str, NDArray]":
+
+        if self.origins == 0:
+            raise BaseException("No forecast origin inside the observed period")
+
+        counts = numpy.where(self.counts > 0, self.counts, numpy.nan)
+
+        return {
+            "mae": self.absolute / counts,
+            "crps": self.crps / counts,
+            "coverage": self.covered / counts,
+            "counts": self.counts,
+        }
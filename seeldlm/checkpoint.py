@@ -0,0 +1,429 @@
+from typing import Any, Dict, List, Literal, Optional, Tuple
+from numpy.typing import NDArray
+import json
+import os
+import pathlib
+import shutil
+import numpy
+
+from .objects import NormalModel, InvWishartModel, TransitionModel
+from .retention import RetentionDLM
+from .containers import (
+    LazyNormalContainer,
+    ModelContainer,
+    TensorContainer,
+    TransitionContainer,
+)
+from .memory import PrimeMemoryDLM, MemoryDLM
+
+META_FILE = "meta.json"
+FILLED_FILE = "filled.npz"
+
+# -- Memory-map modes numpy.load accepts, None reads arrays into memory
+MmapMode = Optional[Literal["r+", "r", "w+", "c"]]
+
+
+def container_filled(container: "ModelContainer") -> "NDArray":
+
+    if isinstance(container, TensorContainer):
+        return container.store.filled[: container.end - container.start].copy()
+
+    filled = numpy.zeros((container.end - container.start,), dtype=bool)
+    for time in container.times():
+        filled[time - container.start] = True
+
+    return filled
+
+
+def container_rows(
+    container: "ModelContainer", indices: "NDArray"
+) -> "Dict[str, Tuple[NDArray, NDArray]]":
+
+    if isinstance(container, TensorContainer):
+        return {
+            field: (indices, tensor[indices])
+            for field, tensor in container.store.tensors.items()
+        }
+
+    # -- Retention can keep some fields on only a subset of the filled rows
+    rows: "Dict[str, Tuple[List[int], List[NDArray]]]" = dict()
+    for index in indices:
+        fields = container.read_fields(container.start + int(index))
+        for field, value in fields.items():
+            field_indices, values = rows.setdefault(field, ([], []))
+            field_indices.append(int(index))
+            values.append(value)
+
+    return {
+        field: (numpy.array(field_indices, dtype=int), numpy.stack(values))
+        for field, (field_indices, values) in rows.items()
+    }
+
+
+def field_filled(filled: "Dict[str, NDArray]", name: "str", field: "str") -> "NDArray":
+    return filled.get(f"{name}.{field}", filled[name])
+
+
+def observed_mask(container: "LazyNormalContainer") -> "NDArray":
+
+    observed = numpy.zeros((container.end - container.start,), dtype=bool)
+    for time in container.times():
+        observed[time - container.start] = True
+
+    return observed
+
+
+def save_container(
+    container: "ModelContainer", directory: "pathlib.Path", name: "str"
+) -> "Dict[str, NDArray]":
+
+    # -- Lazy spaces keep what was evaluated plus the times still pending
+    if isinstance(container, LazyNormalContainer):
+        filled = save_container(container.cache, directory, name)
+        return {**filled, f"{name}.observed": observed_mask(container)}
+
+    container_mask = container_filled(container)
+    indices = container_mask.nonzero()[0]
+    filled = {name: container_mask}
+    if len(indices) == 0:
+        return filled
+
+    for field, (field_indices, rows) in container_rows(container, indices).items():
+        tensor = numpy.zeros(container_mask.shape + rows.shape[1:], dtype=rows.dtype)
+        tensor[field_indices] = rows
+        numpy.save(directory / f"{name}.{field}.npy", tensor)
+
+        if len(field_indices) != len(indices):
+            field_mask = numpy.zeros_like(container_mask)
+            field_mask[field_indices] = True
+            filled[f"{name}.{field}"] = field_mask
+
+    return filled
+
+
+def update_container(
+    container: "ModelContainer",
+    directory: "pathlib.Path",
+    name: "str",
+    saved: "Dict[str, NDArray]",
+) -> "Optional[Dict[str, NDArray]]":
+
+    if isinstance(container, LazyNormalContainer):
+        filled = update_container(container.cache, directory, name, saved)
+        if filled is None:
+            return None
+        return {**filled, f"{name}.observed": observed_mask(container)}
+
+    container_mask = container_filled(container)
+    if not name in saved or container_mask.shape != saved[name].shape:
+        return None
+
+    indices = (container_mask & ~saved[name]).nonzero()[0]
+    filled = {
+        key: mask
+        for key, mask in saved.items()
+        if key.startswith(f"{name}.") and key != f"{name}.observed"
+    }
+    filled[name] = container_mask
+
+    # -- Rows land in place; they only count once the filled masks move on
+    for field, (field_indices, rows) in container_rows(container, indices).items():
+        path = directory / f"{name}.{field}.npy"
+        if not path.exists():
+            return None
+        tensor = numpy.load(path, mmap_mode="r+")
+        if tensor.shape[1:] != rows.shape[1:] or tensor.dtype != rows.dtype:
+            return None
+        tensor[field_indices] = rows
+        tensor.flush()
+        del tensor
+
+        if len(field_indices) != len(indices) or f"{name}.{field}" in filled:
+            field_mask = field_filled(saved, name, field).copy()
+            field_mask[field_indices] = True
+            filled[f"{name}.{field}"] = field_mask
+
+    return filled
+
+
+def restore_container(
+    container: "ModelContainer",
+    directory: "pathlib.Path",
+    name: "str",
+    filled: "Dict[str, NDArray]",
+    mode: "MmapMode",
+    observer: "Optional[TransitionModel]" = None,
+):
+
+    observed = filled.get(f"{name}.observed", filled[name])
+
+    if isinstance(container, LazyNormalContainer):
+        fields = {
+            key: mask for key, mask in filled.items() if key != f"{name}.observed"
+        }
+        restore_container(container.cache, directory, name, fields, mode)
+        for index in observed.nonzero()[0]:
+            time = container.start + int(index)
+            if container.cache.contains(time):
+                container.observers[time] = None
+            elif observer is None:
+                raise BaseException(f"Lazy {name} need an observer to restore")
+            else:
+                container.observers[time] = observer
+        return
+
+    if (observed & ~filled[name]).any():
+        raise BaseException(
+            f"Checkpoint {name} holds unevaluated lazy spaces, restore them lazily"
+        )
+
+    tensors: "Dict[str, Any]" = {
+        path.name[len(name) + 1 : -len(".npy")]: numpy.load(path, mmap_mode=mode)
+        for path in directory.glob(f"{name}.*.npy")
+    }
+
+    masks = {field: field_filled(filled, name, field) for field in tensors}
+
+    if isinstance(container, TensorContainer):
+        if any(not numpy.array_equal(mask, filled[name]) for mask in masks.values()):
+            raise BaseException(
+                f"Checkpoint {name} keeps some fields on only part of its rows, "
+                f"restore it into dict storage"
+            )
+        container.store.filled = filled[name].copy()
+        container.store.tensors = tensors
+        return
+
+    offset = container.start
+    for index in filled[name].nonzero()[0]:
+        fields = {
+            field: tensor[index]
+            for field, tensor in tensors.items()
+            if masks[field][index]
+        }
+        container.write_fields(offset + int(index), fields)
+
+
+def memory_containers(memory: "object") -> "Dict[str, ModelContainer]":
+    return {
+        name: value
+        for name, value in vars(memory).items()
+        if isinstance(value, ModelContainer)
+    }
+
+
+def previous_directory(directory: "pathlib.Path") -> "pathlib.Path":
+    return directory.with_name(directory.name + ".old")
+
+
+def replace_directory(temporary: "pathlib.Path", directory: "pathlib.Path"):
+
+    # -- The old checkpoint stays on disk until the new one is in place
+    previous = previous_directory(directory)
+    if directory.exists():
+        if previous.exists():
+            shutil.rmtree(previous)
+        os.replace(directory, previous)
+
+    os.replace(temporary, directory)
+
+    if previous.exists():
+        shutil.rmtree(previous)
+
+
+def checkpoint_directory(directory: "str") -> "pathlib.Path":
+
+    # -- A crash between the two renames leaves only the previous checkpoint
+    path = pathlib.Path(directory)
+    if not path.exists() and previous_directory(path).exists():
+        return previous_directory(path)
+
+    return path
+
+
+def temporary_directory(target: "pathlib.Path") -> "pathlib.Path":
+
+    temporary = target.with_name(target.name + ".tmp")
+    if temporary.exists():
+        shutil.rmtree(temporary)
+    temporary.mkdir(parents=True)
+
+    return temporary
+
+
+def save_filled(directory: "pathlib.Path", filled: "Dict[str, NDArray]"):
+
+    temporary = directory / (FILLED_FILE + ".tmp")
+    with open(temporary, "wb") as file:
+        numpy.savez(file, **filled)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(temporary, directory / FILLED_FILE)
+
+
+def load_filled(directory: "pathlib.Path") -> "Dict[str, NDArray]":
+    with numpy.load(directory / FILLED_FILE) as filled:
+        return {name: filled[name] for name in filled.files}
+
+
+def save_memory(
+    memory: "MemoryDLM",
+    directory: "str",
+    saved: "Optional[Dict[str, NDArray]]" = None,
+    config: "Optional[Dict[str, Any]]" = None,
+) -> "Dict[str, NDArray]":
+
+    target = pathlib.Path(directory)
+    containers = memory_containers(memory)
+
+    meta = {
+        "S": memory.S,
+        "P": memory.P,
+        "layout": memory.layout,
+        "smoothed_period": memory.smoothed_period,
+        "smoothed_from": memory.smoothed_from,
+        "containers": sorted(containers),
+        "config": config if config is not None else dict(),
+    }
+
+    # -- Within one pass only the rows filled since the last save are written
+    if saved is not None and (target / META_FILE).exists():
+        with open(target / META_FILE) as file:
+            current = json.load(file)
+        filled: "Dict[str, NDArray]" = dict()
+        for name, container in containers.items():
+            if current != meta:
+                break
+            update = update_container(container, target, name, saved)
+            if update is None:
+                break
+            filled.update(update)
+        else:
+            save_filled(target, filled)
+            return filled
+
+    temporary = temporary_directory(target)
+
+    filled = dict()
+    for name, container in containers.items():
+        filled.update(save_container(container, temporary, name))
+    save_filled(temporary, filled)
+
+    with open(temporary / META_FILE, "w") as file:
+        json.dump(meta, file)
+
+    replace_directory(temporary, target)
+
+    return filled
+
+
+def restore_memory(
+    memory: "MemoryDLM",
+    directory: "str",
+    mode: "MmapMode" = "r",
+    observer: "Optional[TransitionModel]" = None,
+):
+
+    source = checkpoint_directory(directory)
+
+    with open(source / META_FILE) as file:
+        meta = json.load(file)
+
+    if meta["S"] != memory.S or meta["P"] != memory.P:
+        raise BaseException(
+            f"Checkpoint periods ({meta['S']},{meta['P']}) differ from "
+            f"memory periods ({memory.S},{memory.P})"
+        )
+
+    layout = meta.get("layout", "dense")
+    if layout != memory.layout:
+        raise BaseException(
+            f"Checkpoint layout {layout} differs from memory layout {memory.layout}"
+        )
+
+    filled = load_filled(source)
+    containers = memory_containers(memory)
+    for name in meta["containers"]:
+        if name in containers:
+            restore_container(containers[name], source, name, filled, mode, observer)
+
+    memory.smoothed_period = meta.get("smoothed_period")
+    memory.smoothed_from = meta.get("smoothed_from", 0)
+
+
+def load_config(directory: "str") -> "Dict[str, Any]":
+
+    with open(checkpoint_directory(directory) / META_FILE) as file:
+        config = json.load(file).get("config", dict())
+
+    if "retention" in config:
+        config["retention"] = RetentionDLM(**config["retention"])
+
+    return config
+
+
+def save_prime_memory(prime_memory: "PrimeMemoryDLM", directory: "str"):
+
+    target = pathlib.Path(directory)
+    temporary = temporary_directory(target)
+
+    numpy.save(temporary / "observations.npy", prime_memory.observations)
+    numpy.save(temporary / "primordial_mean.npy", prime_memory.primordial_model.mean)
+    numpy.save(
+        temporary / "primordial_covariance.npy",
+        prime_memory.primordial_model.covariance,
+    )
+    numpy.save(temporary / "primordial_scale.npy", prime_memory.primordial_error.scale)
+
+    filled = {
+        **save_container(prime_memory.evolvers, temporary, "evolvers"),
+        **save_container(prime_memory.observers, temporary, "observers"),
+    }
+    save_filled(temporary, filled)
+
+    meta = {
+        "S": prime_memory.S,
+        "P": prime_memory.P,
+        "primordial_shape": prime_memory.primordial_error.shape,
+        "evolvers": [prime_memory.evolvers.start, prime_memory.evolvers.end],
+        "observers": [prime_memory.observers.start, prime_memory.observers.end],
+    }
+    with open(temporary / META_FILE, "w") as file:
+        json.dump(meta, file)
+
+    replace_directory(temporary, target)
+
+
+def load_prime_memory(directory: "str", mode: "MmapMode" = "r") -> "PrimeMemoryDLM":
+
+    source = checkpoint_directory(directory)
+
+    with open(source / META_FILE) as file:
+        meta = json.load(file)
+
+    filled = load_filled(source)
+
+    primordial_model = NormalModel(
+        numpy.load(source / "primordial_mean.npy", mmap_mode=mode),
+        numpy.load(source / "primordial_covariance.npy", mmap_mode=mode),
+    )
+    primordial_error = InvWishartModel(
+        numpy.load(source / "primordial_scale.npy", mmap_mode=mode),
+        meta["primordial_shape"],
+    )
+
+    evolvers = TransitionContainer(*meta["evolvers"])
+    restore_container(evolvers, source, "evolvers", filled, mode)
+    observers = TransitionContainer(*meta["observers"])
+    restore_container(observers, source, "observers", filled, mode)
+
+    return PrimeMemoryDLM(
+        meta["S"],
+        meta["P"],
+        numpy.load(source / "observations.npy", mmap_mode=mode),
+        primordial_model,
+        primordial_error,
+        evolvers,
+        observers,
+    )
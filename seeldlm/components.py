@@ -2,8 +2,12 @@ import math
 import numpy
 from numpy.typing import NDArray
 
-from scipy.linalg import block_diag
-from typing import List, Dict, Tuple
+from typing import Any, List, Dict, Tuple, Optional
+
+Block = Tuple[int, int, NDArray]
+
+# -- Operators with at most this many entries are applied as dense matrices
+DENSE_OPERATOR_SIZE = 72 * 72
 
 
 def array_slicer(array: "NDArray", start: "int", amount: "int") -> "NDArray":
@@ -31,6 +35,191 @@ def clean_int_list(int_list: "List[int]", start: "int", end: "int") -> "List[int
     return int_list
 
 
+def diagonal_blocks(matrix: "NDArray") -> "List[Block]":
+
+    blocks: "List[Block]" = list()
+
+    for offset in range(1 - matrix.shape[0], matrix.shape[1]):
+        diagonal = numpy.diagonal(matrix, offset)
+        if numpy.any(diagonal != 0):
+            blocks.append((max(-offset, 0), max(offset, 0), diagonal.copy()))
+
+    return blocks
+
+
+def contiguous(indices: "NDArray") -> "Any":
+
+    flat = indices.ravel()
+    if len(flat) > 0 and numpy.array_equal(flat, flat[0] + numpy.arange(len(flat))):
+        return slice(int(flat[0]), int(flat[0]) + len(flat))
+
+    return indices
+
+
+class BlockOperator:
+
+    __array_ufunc__ = None
+
+    def __init__(self, shape: "Tuple[int, int]", blocks: "List[Block]"):
+        self.shape = shape
+        self.ndim = 2
+        self.blocks = blocks
+        self.dtype = numpy.result_type(float, *[block for _, _, block in blocks])
+        self.transposed: "Optional[BlockOperator]" = None
+        self.plan: "Optional[List[Tuple]]" = None
+        self.complete = False
+        self.dense: "Optional[NDArray]" = None
+
+    def block_shape(self, block: "NDArray") -> "Tuple[int, int]":
+        if block.ndim == 1:
+            return block.shape[0], block.shape[0]
+        return block.shape[0], block.shape[1]
+
+    def compile_plan(self) -> "List[Tuple]":
+
+        if self.plan is not None:
+            return self.plan
+
+        # -- Diagonal blocks collapse into one gather and one vector multiply
+        rows: "List[NDArray]" = []
+        columns: "List[NDArray]" = []
+        values: "List[NDArray]" = []
+
+        # -- Dense blocks of equal shape are stacked into one batched matmul
+        stacks: "Dict[Tuple[int, ...], List[Block]]" = dict()
+
+        for row, column, block in self.blocks:
+            if block.ndim == 1:
+                rows.append(row + numpy.arange(block.shape[0]))
+                columns.append(column + numpy.arange(block.shape[0]))
+                values.append(block)
+            else:
+                stacks.setdefault(block.shape, []).append((row, column, block))
+
+        parts: "List[Tuple]" = []
+        if len(values) > 0:
+            target = numpy.concatenate(rows)
+            source = numpy.concatenate(columns)
+            parts.append((numpy.concatenate(values), source, target))
+
+        for (height, width), members in stacks.items():
+            stack = numpy.stack([block for _, _, block in members])
+            heads = numpy.array([row for row, _, _ in members])
+            tails = numpy.array([column for _, column, _ in members])
+            source = tails[:, None] + numpy.arange(width)
+            target = (heads[:, None] + numpy.arange(height)).ravel()
+            parts.append((stack, source, target))
+
+        # -- Contiguous runs become slices so products land in place
+        self.plan = []
+        covered = numpy.zeros(self.shape[0], dtype=bool)
+        written = numpy.zeros(self.shape[0], dtype=bool)
+        for block, source, target in parts:
+            unique, inverse = numpy.unique(target, return_inverse=True)
+            indicator = None
+            if len(unique) < len(target):
+                indicator = numpy.zeros((len(unique), len(target)))
+                indicator[inverse, numpy.arange(len(target))] = 1.0
+            else:
+                unique = target
+            write = indicator is None and not covered[unique].any()
+            covered[unique] = True
+            written[unique] |= write
+            self.plan.append(
+                (block, contiguous(source), contiguous(unique), indicator, write)
+            )
+
+        self.complete = bool(written.all())
+
+        return self.plan
+
+    def __matmul__(self, array: "NDArray") -> "NDArray":
+
+        # -- Python-level dispatch only pays off for large operators
+        if self.shape[0] * self.shape[1] <= DENSE_OPERATOR_SIZE:
+            if self.dense is None:
+                self.dense = self.toarray()
+            return self.dense @ array
+
+        plan = self.compile_plan()
+        shape = array.shape[:-2] + (self.shape[0], array.shape[-1])
+        dtype = numpy.result_type(self.dtype, array)
+        allocate = numpy.empty if self.complete else numpy.zeros
+        output = allocate(shape, dtype)
+
+        for block, source, target, indicator, write in plan:
+            if isinstance(source, slice):
+                gathered = array[..., source, :]
+            else:
+                gathered = array[..., source.ravel(), :]
+            into = None
+            if block.ndim == 1:
+                if write and isinstance(target, slice):
+                    into = output[..., target, :]
+                product = numpy.multiply(block[:, None], gathered, out=into)
+            else:
+                stacked = shape[:-2] + block.shape[:1] + (-1, shape[-1])
+                gathered = gathered.reshape(stacked)
+                if write and isinstance(target, slice):
+                    into = output[..., target, :].reshape(
+                        shape[:-2] + block.shape[:2] + (shape[-1],)
+                    )
+                    into = into if numpy.shares_memory(into, output) else None
+                product = numpy.matmul(block, gathered, out=into)
+                product = product.reshape(shape[:-2] + (-1, shape[-1]))
+            if into is not None:
+                continue
+            if indicator is not None:
+                product = indicator @ product
+            if write:
+                output[..., target, :] = product
+            else:
+                output[..., target, :] += product
+
+        return output
+
+    def __rmatmul__(self, array: "NDArray") -> "NDArray":
+        return (self.T @ array.swapaxes(-1, -2)).swapaxes(-1, -2)
+
+    @property
+    def T(self) -> "BlockOperator":
+
+        if self.transposed is None:
+            blocks: "List[Block]" = [
+                (column, row, block if block.ndim == 1 else block.T)
+                for row, column, block in self.blocks
+            ]
+            self.transposed = BlockOperator((self.shape[1], self.shape[0]), blocks)
+            self.transposed.transposed = self
+
+        return self.transposed
+
+    def swapaxes(self, axis1: "int", axis2: "int") -> "BlockOperator":
+
+        if not {axis1 % 2, axis2 % 2} == {0, 1}:
+            raise BaseException(f"Cannot swap axes {axis1} and {axis2}")
+
+        return self.T
+
+    def toarray(self) -> "NDArray":
+
+        output = numpy.zeros(self.shape, self.dtype)
+
+        for row, column, block in self.blocks:
+            height, width = self.block_shape(block)
+            if block.ndim == 1:
+                block = numpy.diag(block)
+            output[row : row + height, column : column + width] += block
+
+        return output
+
+    def __array__(self, dtype=None, copy=None) -> "NDArray":
+
+        output = self.toarray()
+
+        return output if dtype is None else output.astype(dtype)
+
+
 class ObservationFactory:
     def __init__(self):
         pass
@@ -95,6 +284,8 @@ class TransitionFactory:
 
         harmonics = [self.harmonic(period, factor) for period in range(start, end)]
 
+        from scipy.linalg import block_diag
+
         transition = block_diag(*harmonics)
 
         return transition
@@ -120,23 +311,34 @@ class ModelComponent:
         dimension: "int",
         transition: "NDArray",
         observation: "NDArray",
+        blocks: "Optional[List[Block]]" = None,
     ):
         self.dimension = dimension
         self.transition = transition
         self.observation = observation
 
+        if blocks is None:
+            blocks = [(0, 0, transition)] if dimension > 0 else []
+        self.blocks = blocks
+
     def covariate(self, dimension: "int", indices: "List[int]" = []) -> "NDArray":
 
         template = numpy.zeros((dimension, self.dimension))
 
         if len(indices) > 0:
             indices = clean_int_list(indices, 0, dimension)
-            template[
-                indices,
-            ] = self.observation
+            template[indices,] = self.observation
 
         return template
 
+    def covariate_blocks(
+        self, dimension: "int", indices: "List[int]" = []
+    ) -> "List[Block]":
+
+        indices = clean_int_list(indices, 0, dimension)
+
+        return [(index, 0, self.observation[None, :]) for index in indices]
+
 
 class ComponentFactory:
     def __init__(self):
@@ -145,17 +347,23 @@ class ComponentFactory:
         self.observation_factory = ObservationFactory()
 
     def form_free(self, dimension: "int", factor: "float" = 1) -> "ModelComponent":
+        transition = self.transition_factory.form_free(dimension, factor)
+
         return ModelComponent(
             dimension,
-            self.transition_factory.form_free(dimension, factor),
+            transition,
             self.observation_factory.basic(dimension),
+            diagonal_blocks(transition),
         )
 
     def polynomial(self, dimension: "int", factor: "float" = 1) -> "ModelComponent":
+        transition = self.transition_factory.polynomial(dimension, factor)
+
         return ModelComponent(
             dimension,
-            self.transition_factory.polynomial(dimension, factor),
+            transition,
             self.observation_factory.basic(dimension),
+            diagonal_blocks(transition),
         )
 
     def harmonics(
@@ -165,6 +373,10 @@ class ComponentFactory:
             2 * amount,
             self.transition_factory.harmonics(start, amount, factor),
             self.observation_factory.harmonics(amount),
+            [
+                (2 * index, 2 * index, self.transition_factory.harmonic(period, factor))
+                for index, period in enumerate(range(start, start + amount))
+            ],
         )
 
     def regression(
@@ -174,6 +386,7 @@ class ComponentFactory:
             amount,
             self.transition_factory.basic(amount),
             array_slicer(data, start, amount),
+            [(0, 0, numpy.ones((amount,)))],
         )
 
     def autoregression(self, dimension: "int", data: "NDArray") -> "ModelComponent":
@@ -239,3 +452,43 @@ class ModelCompiler:
         block_matrix = [self.observation_block(y) for y in range(amount)]
 
         return numpy.block(block_matrix)
+
+    def offsets(self) -> "List[int]":
+
+        dimensions = [component.dimension for component in self.components]
+
+        return [sum(dimensions[:index]) for index in range(len(dimensions) + 1)]
+
+    def compile_transition_operator(self) -> "BlockOperator":
+
+        amount = len(self.components)
+        offsets = self.offsets()
+
+        blocks: "List[Block]" = list()
+        for x in range(amount):
+            for y in range(amount):
+                if x == y:
+                    local_blocks = self.components[y].blocks
+                else:
+                    indices = self.vertices.get((x, y), [])
+                    local_blocks = self.components[y].covariate_blocks(
+                        self.components[x].dimension, indices
+                    )
+                for row, column, block in local_blocks:
+                    blocks.append((offsets[x] + row, offsets[y] + column, block))
+
+        return BlockOperator((offsets[-1], offsets[-1]), blocks)
+
+    def compile_observation_operator(self) -> "BlockOperator":
+
+        amount = len(self.components)
+        offsets = self.offsets()
+
+        blocks: "List[Block]" = list()
+        for y in range(amount):
+            indices = self.vertices.get((-1, y), [])
+            local_blocks = self.components[y].covariate_blocks(self.M, indices)
+            for row, column, block in local_blocks:
+                blocks.append((row, offsets[y] + column, block))
+
+        return BlockOperator((self.M, offsets[-1]), blocks)
@@ -1,14 +1,110 @@
-from typing import Dict, Generator, TypeVar, Generic, List
+from typing import Dict, Generator, TypeVar, Generic, List, Optional
+from abc import ABC, abstractmethod
+from functools import lru_cache
 from numpy.typing import NDArray
-from scipy.stats import t as gen_t
-from numpy import array
+from numpy import array, arange, empty, zeros, asarray, stack, triu_indices, unique
+from numpy import can_cast, result_type
 
-from .objects import NormalModel, InvWishartModel, TransitionModel
+from .objects import NormalModel, InvWishartModel, TransitionModel, JointModel
 
 T = TypeVar("T")
 
+LAYOUTS = ("dense", "packed", "diagonal")
 
-class ModelContainer(Generic[T]):
+
+def check_layout(layout: "str") -> "str":
+    if not layout in LAYOUTS:
+        raise BaseException(f"Unknown covariance layout {layout}")
+    return layout
+
+
+def packed_dimension(packed: "NDArray", layout: "str") -> "int":
+    length = packed.shape[-1]
+    if layout == "diagonal":
+        return length
+    return int(round(((8 * length + 1) ** 0.5 - 1) / 2))
+
+
+def pack_covariance(covariance: "NDArray", layout: "str") -> "NDArray":
+
+    if covariance is None or layout == "dense":
+        return covariance
+
+    if layout == "diagonal":
+        return covariance.diagonal(axis1=-2, axis2=-1).copy()
+
+    rows, cols = triu_indices(covariance.shape[-1])
+    return covariance[..., rows, cols]
+
+
+def unpack_covariance(packed: "NDArray", layout: "str") -> "NDArray":
+
+    if packed is None or layout == "dense":
+        return packed
+
+    if layout == "diagonal":
+        raise BaseException("Off-diagonal covariances were not retained")
+
+    dimension = packed_dimension(packed, layout)
+    covariance = zeros(packed.shape[:-1] + (dimension, dimension), packed.dtype)
+
+    rows, cols = triu_indices(dimension)
+    covariance[..., rows, cols] = packed
+    covariance[..., cols, rows] = packed
+    return covariance
+
+
+def packed_diagonal(packed: "NDArray", layout: "str") -> "NDArray":
+
+    if layout == "dense":
+        return packed.diagonal(axis1=-2, axis2=-1)
+
+    if layout == "diagonal":
+        return packed
+
+    dimension = packed_dimension(packed, layout)
+    rows = arange(dimension)
+    return packed[..., rows * dimension - rows * (rows - 1) // 2]
+
+
+@lru_cache(maxsize=4096)
+def t_quantile(probability: "float", shape: "float") -> "float":
+    from scipy.stats import t as gen_t
+
+    return gen_t.ppf(probability, shape).item()
+
+
+def t_quantiles(significance_level: "float", shapes: "NDArray") -> "NDArray":
+
+    # -- Shapes repeat heavily across time, so only unique ones hit scipy
+    shapes = asarray(shapes, dtype=float)
+    values, inverse = unique(shapes, return_inverse=True)
+    quantiles = array(
+        [t_quantile(1 - significance_level / 2, value) for value in values.tolist()]
+    )
+    return quantiles[inverse].reshape(shapes.shape)
+
+
+def packed_entry(
+    packed: "NDArray", layout: "str", feature_x: "int", feature_y: "int"
+) -> "NDArray":
+
+    if layout == "dense":
+        return packed[..., feature_x, feature_y]
+
+    if layout == "diagonal":
+        if feature_x != feature_y:
+            raise BaseException("Off-diagonal covariances were not retained")
+        return packed[..., feature_x]
+
+    # -- Row-major upper triangle: rows before x hold sum(d - r) entries
+    dimension = packed_dimension(packed, layout)
+    row, col = min(feature_x, feature_y), max(feature_x, feature_y)
+    offset = row * dimension - row * (row - 1) // 2
+    return packed[..., offset + col - row]
+
+
+class ModelContainer(ABC, Generic[T]):
     def __init__(self, start: "int", end: "int"):
         self.start = start
         self.end = end
@@ -21,6 +117,9 @@ class ModelContainer(Generic[T]):
         if not self.start <= time < self.end:
             raise BaseException(f"Set outside interval [{self.start},{self.end})")
 
+        if not time in self.container:
+            raise BaseException("Incomplete container")
+
         return self.container[time]
 
     def set_at_time(self, time: "int", object: "T"):
@@ -34,40 +133,152 @@ class ModelContainer(Generic[T]):
                 raise BaseException("Incomplete container")
             yield self.container[index]
 
+    def times(self) -> "List[int]":
+        return sorted(self.container)
+
+    def contains(self, time: "int") -> "bool":
+        return time in self.container
+
+    def discard(self, time: "int"):
+        if time in self.container:
+            del self.container[time]
+
+    def resize(self, start: "int", end: "int"):
+        self.start = start
+        self.end = end
+        self.container = {
+            time: object
+            for time, object in self.container.items()
+            if start <= time < end
+        }
+
+    def read_fields(self, time: "int") -> "Dict[str, NDArray]":
+        return self.fields(self.get_from_time(time))
+
+    def write_fields(self, time: "int", fields: "Dict[str, NDArray]"):
+        self.set_at_time(time, self.compose(fields))
+
+    @abstractmethod
+    def fields(self, object: "T") -> "Dict[str, NDArray]":
+        pass
+
+    @abstractmethod
+    def compose(self, fields: "Dict[str, NDArray]") -> "T":
+        pass
+
 
 class NormalContainer(ModelContainer[NormalModel]):
-    def __init__(self, start: "int", end: "int"):
+    def __init__(self, start: "int", end: "int", layout: "str" = "dense"):
         super().__init__(start, end)
+        self.layout = check_layout(layout)
+
+    def fields(self, object: "NormalModel") -> "Dict[str, NDArray]":
+        if object.covariance is None:
+            return {"mean": object.mean}
+        return {
+            "mean": object.mean,
+            "covariance": pack_covariance(object.covariance, self.layout),
+        }
+
+    def compose(self, fields: "Dict[str, NDArray]") -> "NormalModel":
+        if not "covariance" in fields:
+            return NormalModel.mean_only(fields["mean"])
+        return NormalModel(
+            fields["mean"], unpack_covariance(fields["covariance"], self.layout)
+        )
+
+    def get_from_time(self, time: "int") -> "NormalModel":
+        object = super().get_from_time(time)
+        return NormalModel(
+            object.mean, unpack_covariance(object.covariance, self.layout)
+        )
+
+    def set_at_time(self, time: "int", object: "NormalModel"):
+        super().set_at_time(
+            time,
+            NormalModel(object.mean, pack_covariance(object.covariance, self.layout)),
+        )
+
+    def read_fields(self, time: "int") -> "Dict[str, NDArray]":
+        object = super().get_from_time(time)
+        if object.covariance is None:
+            return {"mean": object.mean}
+        return {"mean": object.mean, "covariance": object.covariance}
+
+    def write_fields(self, time: "int", fields: "Dict[str, NDArray]"):
+        if not "covariance" in fields:
+            object = NormalModel.mean_only(fields["mean"])
+        else:
+            object = NormalModel(fields["mean"], fields["covariance"])
+        super().set_at_time(time, object)
+
+    def generate_container(
+        self, start: "int", end: "int"
+    ) -> "Generator[NormalModel, None, None]":
+        for object in super().generate_container(start, end):
+            yield NormalModel(
+                object.mean, unpack_covariance(object.covariance, self.layout)
+            )
 
     def mean(
         self, start: "int", end: "int", feature: "int", subject: "int"
     ) -> "NDArray":
-        data_list: "List[float]" = []
-        for model in self.generate_container(start, end):
-            value = model.mean[feature, subject]
+        data_list: "List[NDArray]" = []
+        for model in ModelContainer.generate_container(self, start, end):
+            value = model.mean[..., feature, subject]
             data_list.append(value)
         return array(data_list)
 
     def covariance(
         self, start: "int", end: "int", feature_x: "int", feature_y: "int"
     ) -> "NDArray":
-        data_list: "List[float]" = []
-        for model in self.generate_container(start, end):
-            value = model.covariance[feature_x, feature_y]
+        data_list: "List[NDArray]" = []
+        for model in ModelContainer.generate_container(self, start, end):
+            if model.covariance is None:
+                raise BaseException("Covariances were not retained")
+            value = packed_entry(model.covariance, self.layout, feature_x, feature_y)
             data_list.append(value)
         return array(data_list)
 
+    def means(self, start: "int", end: "int") -> "NDArray":
+        return stack(
+            [
+                model.mean
+                for model in ModelContainer.generate_container(self, start, end)
+            ]
+        )
+
+    def variances(self, start: "int", end: "int") -> "NDArray":
+        packed = [
+            model.covariance
+            for model in ModelContainer.generate_container(self, start, end)
+        ]
+        return packed_diagonal(stack(packed), self.layout)
+
+    def covariances(self, start: "int", end: "int") -> "NDArray":
+        packed = [
+            model.covariance
+            for model in ModelContainer.generate_container(self, start, end)
+        ]
+        return unpack_covariance(stack(packed), self.layout)
+
 
 class InvWishartContainer(ModelContainer[InvWishartModel]):
     def __init__(self, start: "int", end: "int"):
         super().__init__(start, end)
 
+    def fields(self, object: "InvWishartModel") -> "Dict[str, NDArray]":
+        return {"scale": object.scale, "shape": asarray(object.shape)}
+
+    def compose(self, fields: "Dict[str, NDArray]") -> "InvWishartModel":
+        return InvWishartModel(fields["scale"], fields["shape"].item())
+
     def scale(
         self, start: "int", end: "int", subject_x: "int", subject_y: "int"
     ) -> "NDArray":
-        data_list: "List[float]" = []
+        data_list: "List[NDArray]" = []
         for model in self.generate_container(start, end):
-            value = model.scale[subject_x, subject_y]
+            value = model.scale[..., subject_x, subject_y]
             data_list.append(value)
         return array(data_list)
 
@@ -78,21 +289,382 @@ class InvWishartContainer(ModelContainer[InvWishartModel]):
             data_list.append(value)
         return array(data_list)
 
+    def scales(self, start: "int", end: "int") -> "NDArray":
+        return stack([model.scale for model in self.generate_container(start, end)])
+
     def t_shape(
         self, start: "int", end: "int", significance_level: "float"
     ) -> "NDArray":
-        data_list: "List[float]" = []
-        for shape in self.shape(start, end):
-            value: "float" = gen_t.ppf(1 - significance_level / 2, shape).item()
-            data_list.append(value)
-        return array(data_list)
+        return t_quantiles(significance_level, self.shape(start, end))
 
 
 class TransitionContainer(ModelContainer[TransitionModel]):
     def __init__(self, start: "int", end: "int"):
         super().__init__(start, end)
 
+    def fields(self, object: "TransitionModel") -> "Dict[str, NDArray]":
+        return {
+            "bias": object.bias,
+            "weights": asarray(object.weights),
+            "covariance": object.covariance,
+        }
+
+    def compose(self, fields: "Dict[str, NDArray]") -> "TransitionModel":
+        return TransitionModel(fields["bias"], fields["weights"], fields["covariance"])
+
+    def weights(self, start: "int", end: "int") -> "NDArray":
+        return stack([model.weights for model in self.generate_container(start, end)])
+
 
 class ArrayContainer(ModelContainer[NDArray]):
     def __init__(self, start: "int", end: "int"):
         super().__init__(start, end)
+
+    def fields(self, object: "NDArray") -> "Dict[str, NDArray]":
+        return {"array": object}
+
+    def compose(self, fields: "Dict[str, NDArray]") -> "NDArray":
+        return fields["array"]
+
+    def arrays(self, start: "int", end: "int") -> "NDArray":
+        return stack(list(self.generate_container(start, end)))
+
+
+class TensorStore:
+    def __init__(self, start: "int", end: "int"):
+        self.start = start
+        self.end = end
+        self.tensors: "Dict[str, NDArray]" = dict()
+        self.filled: "NDArray" = zeros((end - start,), dtype=bool)
+
+    def __len__(self) -> "int":
+        return int(self.filled.sum())
+
+    def index(self, time: "int") -> "int":
+        if not self.start <= time < self.end:
+            raise BaseException(f"Set outside interval [{self.start},{self.end})")
+
+        return time - self.start
+
+    def capacity(self) -> "int":
+        return self.filled.shape[0]
+
+    def resize(self, start: "int", end: "int"):
+
+        if start != self.start:
+            raise BaseException(f"Cannot move start from {self.start} to {start}")
+
+        self.end = end
+        if end - start <= self.capacity():
+            self.filled[end - start :] = False
+            return
+
+        # -- Grow geometrically so repeated appends copy O(total) rows
+        capacity = max(end - start, 2 * self.capacity())
+        length = self.capacity()
+
+        filled = zeros((capacity,), dtype=bool)
+        filled[:length] = self.filled
+        self.filled = filled
+
+        for name, tensor in self.tensors.items():
+            grown = empty((capacity,) + tensor.shape[1:], dtype=tensor.dtype)
+            grown[:length] = tensor
+            self.tensors[name] = grown
+
+    def write(self, time: "int", **arrays: "NDArray"):
+        index = self.index(time)
+
+        for name, value in arrays.items():
+            value = asarray(value)
+            if not name in self.tensors:
+                shape = (self.capacity(),) + value.shape
+                self.tensors[name] = empty(shape, dtype=value.dtype)
+            elif not can_cast(value.dtype, self.tensors[name].dtype):
+                # -- Promote the field rather than truncate wider values into it
+                dtype = result_type(self.tensors[name].dtype, value.dtype)
+                self.tensors[name] = self.tensors[name].astype(dtype)
+            self.tensors[name][index] = value
+
+        self.filled[index] = True
+
+    def read_all(self, time: "int") -> "Dict[str, NDArray]":
+        if not self.filled[self.index(time)]:
+            raise BaseException("Incomplete container")
+
+        return {name: self.read(time, name) for name in self.tensors}
+
+    def read(self, time: "int", name: "str") -> "NDArray":
+        index = self.index(time)
+
+        if not self.filled[index]:
+            raise BaseException("Incomplete container")
+
+        return self.tensors[name][index]
+
+    def slice(self, name: "str", start: "int", end: "int") -> "NDArray":
+        left = start - self.start
+        right = end - self.start
+
+        if (
+            left < 0
+            or right > self.end - self.start
+            or not self.filled[left:right].all()
+        ):
+            raise BaseException("Incomplete container")
+
+        return self.tensors[name][left:right]
+
+
+class TensorContainer(ModelContainer[T]):
+    def __init__(self, start: "int", end: "int"):
+        super().__init__(start, end)
+        self.store = TensorStore(start, end)
+
+    def __len__(self) -> "int":
+        return self.store.__len__()
+
+    def get_from_time(self, time: "int") -> "T":
+        return self.compose(self.store.read_all(time))
+
+    def set_at_time(self, time: "int", object: "T"):
+        self.store.write(time, **self.fields(object))
+
+    def read_fields(self, time: "int") -> "Dict[str, NDArray]":
+        return self.store.read_all(time)
+
+    def write_fields(self, time: "int", fields: "Dict[str, NDArray]"):
+        self.store.write(time, **fields)
+
+    def generate_container(
+        self, start: "int", end: "int"
+    ) -> "Generator[T, None, None]":
+        for index in range(start, end):
+            yield self.get_from_time(index)
+
+    def times(self) -> "List[int]":
+        return [self.start + int(index) for index in self.store.filled.nonzero()[0]]
+
+    def contains(self, time: "int") -> "bool":
+        return self.start <= time < self.end and bool(
+            self.store.filled[time - self.start]
+        )
+
+    def discard(self, time: "int"):
+        if self.contains(time):
+            self.store.filled[time - self.start] = False
+
+    def resize(self, start: "int", end: "int"):
+        super().resize(start, end)
+        self.store.resize(start, end)
+
+
+class TensorNormalContainer(TensorContainer[NormalModel], NormalContainer):
+    def __init__(self, start: "int", end: "int", layout: "str" = "dense"):
+        super().__init__(start, end)
+        self.layout = check_layout(layout)
+
+    def mean(
+        self, start: "int", end: "int", feature: "int", subject: "int"
+    ) -> "NDArray":
+        return self.store.slice("mean", start, end)[:, ..., feature, subject]
+
+    def covariance(
+        self, start: "int", end: "int", feature_x: "int", feature_y: "int"
+    ) -> "NDArray":
+        packed = self.store.slice("covariance", start, end)
+        return packed_entry(packed, self.layout, feature_x, feature_y)
+
+    def means(self, start: "int", end: "int") -> "NDArray":
+        return self.store.slice("mean", start, end)
+
+    def covariances(self, start: "int", end: "int") -> "NDArray":
+        return unpack_covariance(
+            self.store.slice("covariance", start, end), self.layout
+        )
+
+    def variances(self, start: "int", end: "int") -> "NDArray":
+        return packed_diagonal(self.store.slice("covariance", start, end), self.layout)
+
+
+class TensorInvWishartContainer(TensorContainer[InvWishartModel], InvWishartContainer):
+    def scale(
+        self, start: "int", end: "int", subject_x: "int", subject_y: "int"
+    ) -> "NDArray":
+        return self.store.slice("scale", start, end)[:, ..., subject_x, subject_y]
+
+    def shape(self, start: "int", end: "int") -> "NDArray":
+        return self.store.slice("shape", start, end)
+
+    def scales(self, start: "int", end: "int") -> "NDArray":
+        return self.store.slice("scale", start, end)
+
+
+class TensorTransitionContainer(TensorContainer[TransitionModel], TransitionContainer):
+    def weights(self, start: "int", end: "int") -> "NDArray":
+        return self.store.slice("weights", start, end)
+
+
+class TensorArrayContainer(TensorContainer[NDArray], ArrayContainer):
+    def arrays(self, start: "int", end: "int") -> "NDArray":
+        return self.store.slice("array", start, end)
+
+
+class LazyNormalContainer(NormalContainer):
+    def __init__(
+        self,
+        start: "int",
+        end: "int",
+        source: "NormalContainer",
+        cache: "NormalContainer",
+    ):
+        super().__init__(start, end, cache.layout)
+        self.source = source
+        self.cache = cache
+        self.observers: "Dict[int, Optional[TransitionModel]]" = dict()
+
+    def __len__(self) -> "int":
+        return self.observers.__len__()
+
+    def observe(self, time: "int", observer: "TransitionModel"):
+        if not self.start <= time < self.end:
+            raise BaseException(f"Set outside interval [{self.start},{self.end})")
+
+        self.observers[time] = observer
+        self.cache.discard(time)
+
+    def evaluate(self, start: "int", end: "int"):
+
+        missing = [time for time in range(start, end) if not self.cache.contains(time)]
+        if len(missing) == 0:
+            return
+
+        observers: "List[TransitionModel]" = []
+        for time in missing:
+            observer = self.observers.get(time)
+            if observer is None:
+                raise BaseException("Incomplete container")
+            observers.append(observer)
+
+        # -- Vectorise over the requested range when one observer covers it
+        shared = set(id(observer) for observer in observers)
+        if len(shared) == 1 and missing == list(range(missing[0], end)):
+            states = NormalModel(
+                self.source.means(missing[0], end),
+                self.source.covariances(missing[0], end),
+            )
+            spaces = JointModel(states, observers[0]).mutate_normal()
+            for index, time in enumerate(missing):
+                space = NormalModel(spaces.mean[index], spaces.covariance[index])
+                self.cache.set_at_time(time, space)
+            return
+
+        for time, observer in zip(missing, observers):
+            state = self.source.get_from_time(time)
+            space = JointModel(state, observer).mutate_normal()
+            self.cache.set_at_time(time, space)
+
+    def get_from_time(self, time: "int") -> "NormalModel":
+        if not self.start <= time < self.end:
+            raise BaseException(f"Set outside interval [{self.start},{self.end})")
+
+        self.evaluate(time, time + 1)
+
+        return self.cache.get_from_time(time)
+
+    def set_at_time(self, time: "int", object: "NormalModel"):
+        self.observers.setdefault(time, None)
+        self.cache.set_at_time(time, object)
+
+    def generate_container(
+        self, start: "int", end: "int"
+    ) -> "Generator[NormalModel, None, None]":
+        self.evaluate(start, end)
+        return self.cache.generate_container(start, end)
+
+    def times(self) -> "List[int]":
+        return sorted(self.observers)
+
+    def contains(self, time: "int") -> "bool":
+        return time in self.observers
+
+    def discard(self, time: "int"):
+        self.observers.pop(time, None)
+        self.cache.discard(time)
+
+    def resize(self, start: "int", end: "int"):
+        super().resize(start, end)
+        self.cache.resize(start, end)
+        self.observers = {
+            time: observer
+            for time, observer in self.observers.items()
+            if start <= time < end
+        }
+
+    def mean(
+        self, start: "int", end: "int", feature: "int", subject: "int"
+    ) -> "NDArray":
+        self.evaluate(start, end)
+        return self.cache.mean(start, end, feature, subject)
+
+    def covariance(
+        self, start: "int", end: "int", feature_x: "int", feature_y: "int"
+    ) -> "NDArray":
+        self.evaluate(start, end)
+        return self.cache.covariance(start, end, feature_x, feature_y)
+
+    def means(self, start: "int", end: "int") -> "NDArray":
+        self.evaluate(start, end)
+        return self.cache.means(start, end)
+
+    def covariances(self, start: "int", end: "int") -> "NDArray":
+        self.evaluate(start, end)
+        return self.cache.covariances(start, end)
+
+    def variances(self, start: "int", end: "int") -> "NDArray":
+        self.evaluate(start, end)
+        return self.cache.variances(start, end)
+
+
+class ContainerFactory:
+    def __init__(self, storage: "str" = "dict"):
+
+        if not storage in ("dict", "tensor"):
+            raise BaseException(f"Unknown storage {storage}")
+
+        self.storage = storage
+
+    def normal(
+        self, start: "int", end: "int", layout: "str" = "dense"
+    ) -> "NormalContainer":
+        if self.storage == "tensor":
+            return TensorNormalContainer(start, end, layout)
+        return NormalContainer(start, end, layout)
+
+    def wishart(self, start: "int", end: "int") -> "InvWishartContainer":
+        if self.storage == "tensor":
+            return TensorInvWishartContainer(start, end)
+        return InvWishartContainer(start, end)
+
+    def transition(self, start: "int", end: "int") -> "TransitionContainer":
+        if self.storage == "tensor":
+            return TensorTransitionContainer(start, end)
+        return TransitionContainer(start, end)
+
+    def space(
+        self,
+        start: "int",
+        end: "int",
+        source: "NormalContainer",
+        lazy: "bool",
+        layout: "str" = "dense",
+    ) -> "NormalContainer":
+        cache = self.normal(start, end, layout)
+        if lazy:
+            return LazyNormalContainer(start, end, source, cache)
+        return cache
+
+    def array(self, start: "int", end: "int") -> "ArrayContainer":
+        if self.storage == "tensor":
+            return TensorArrayContainer(start, end)
+        return ArrayContainer(start, end)
@@ -0,0 +1,162 @@
+from typing import List
+from numpy.typing import NDArray
+import numpy
+
+from .objects import NormalModel, TransitionModel, InvWishartModel
+from .objects.utils import symmetrise, transpose
+from .containers import TransitionContainer
+from .memory import PrimeMemoryDLM
+from .funcs import ModellerDLM
+
+
+class FitterDLM:
+    def __init__(
+        self,
+        prime_memory: "PrimeMemoryDLM",
+        storage: "str" = "tensor",
+        numerics: "str" = "inverse",
+        fit_evolver: "bool" = True,
+        fit_observer: "bool" = True,
+        fit_primordial: "bool" = True,
+    ):
+
+        if prime_memory.observations.ndim != 3:
+            raise BaseException("FitterDLM expects a single (M, N, T) series")
+
+        evolvers = TransitionContainer(0, 1)
+        evolvers.set_at_time(0, prime_memory.evolvers.get_from_time(0))
+        observers = TransitionContainer(0, 1)
+        observers.set_at_time(0, prime_memory.observers.get_from_time(0))
+
+        self.prime_memory = PrimeMemoryDLM(
+            prime_memory.S,
+            prime_memory.P,
+            prime_memory.observations,
+            prime_memory.primordial_model,
+            prime_memory.primordial_error,
+            evolvers,
+            observers,
+        )
+        self.modeller = ModellerDLM(self.prime_memory, storage, numerics)
+
+        self.fit_evolver = fit_evolver
+        self.fit_observer = fit_observer
+        self.fit_primordial = fit_primordial
+
+        self.log_likelihoods: "List[float]" = list()
+
+    def expectation(self) -> "float":
+
+        self.modeller.forward()
+        self.modeller.backward()
+
+        return float(self.modeller.log_likelihood())
+
+    def maximisation(self):
+
+        memory = self.modeller.get_memory()
+        S = self.prime_memory.S
+
+        means = memory.smoothed_states.means(0, S + 1)  # (S + 1, P, N)
+        covariances = memory.smoothed_states.covariances(0, S + 1)  # (S + 1, P, P)
+        weights = memory.smoothers.weights(1, S + 1)  # (S, P, P)
+
+        wishart: "InvWishartModel" = memory.wisharts.get_from_time(S)
+        constant = wishart.shape / wishart.scale.shape[-1]
+
+        if self.fit_evolver:
+            evolver: "TransitionModel" = self.prime_memory.evolvers.get_from_time(0)
+            A = evolver.weights
+
+            # -- Sufficient statistics summed over time
+            current_sum = covariances[1:].sum(axis=0)
+            previous_sum = covariances[:-1].sum(axis=0)
+            cross_sum = (covariances[1:] @ transpose(weights)).sum(axis=0)
+            errors = means[1:] - evolver.bias - A @ means[:-1]
+
+            variation = (
+                current_sum
+                + A @ previous_sum @ transpose(A)
+                - cross_sum @ transpose(A)
+                - A @ transpose(cross_sum)
+                + constant * self.spread(errors, wishart)
+            ) / S
+
+            self.prime_memory.evolvers.set_at_time(
+                0, TransitionModel(evolver.bias, A, symmetrise(variation))
+            )
+
+        if self.fit_observer:
+            observer: "TransitionModel" = self.prime_memory.observers.get_from_time(0)
+            H = observer.weights
+
+            observations = numpy.moveaxis(
+                self.prime_memory.observations[..., :S], -1, 0
+            )
+            errors = observations - observer.bias - H @ means[1:]
+
+            variation = (
+                H @ covariances[1:].sum(axis=0) @ transpose(H)
+                + constant * self.spread(errors, wishart)
+            ) / S
+
+            self.prime_memory.observers.set_at_time(
+                0, TransitionModel(observer.bias, H, symmetrise(variation))
+            )
+
+        if self.fit_primordial:
+            primordial_error = self.prime_memory.primordial_error
+
+            scale = primordial_error.derive_scale_em_estimate(wishart)
+
+            # -- Tensor stores hand out views, which the next backward overwrites
+            self.prime_memory.primordial_model = NormalModel(
+                means[0].copy(), covariances[0].copy()
+            )
+            self.prime_memory.primordial_error = InvWishartModel(
+                symmetrise(scale), primordial_error.shape
+            )
+
+            memory.scale_em.set_at_time(0, scale)
+            memory.primordial_em.set_at_time(0, covariances[0].copy())
+
+    def spread(self, errors: "NDArray", wishart: "InvWishartModel") -> "NDArray":
+
+        if self.modeller.get_memory().numerics == "inverse":
+            return numpy.einsum(
+                "tpn,nk,tqk->pq", errors, wishart.invert_scale(), errors
+            )
+
+        # -- Whiten against the scale factor instead of inverting the scale
+        T, P, N = errors.shape
+        whitened = wishart.whiten(numpy.moveaxis(errors, -1, 0).reshape(N, T * P))
+        whitened = whitened.reshape(N, T, P)
+
+        return numpy.einsum("ntp,ntq->pq", whitened, whitened)
+
+    def fit(
+        self, tolerance: "float" = 1e-6, max_iterations: "int" = 50
+    ) -> "ModellerDLM":
+
+        log_likelihood = self.expectation()
+        self.log_likelihoods.append(log_likelihood)
+
+        # -- Every maximisation is followed by an expectation, so the returned
+        # -- modeller is always filtered under the final parameters
+        for _ in range(max_iterations):
+
+            previous = log_likelihood
+            self.maximisation()
+
+            log_likelihood = self.expectation()
+            self.log_likelihoods.append(log_likelihood)
+
+            if abs(log_likelihood - previous) <= tolerance * (
+                abs(previous) + tolerance
+            ):
+                break
+
+        return self.modeller
+
+    def get_prime_memory(self) -> "PrimeMemoryDLM":
+        return self.prime_memory
@@ -0,0 +1,134 @@
+from typing import Dict, List, Sequence, Tuple
+from numpy.typing import NDArray
+import copy
+import numpy
+
+from .objects import NormalModel, TransitionModel, JointModel, InvWishartModel
+from .objects.utils import check_numerics, transpose
+from .intervals import interval_errors
+
+# -- (weights, bias, covariance) of the map from the origin to a horizon
+Propagator = Tuple[NDArray, NDArray, NDArray]
+
+
+class ForecastDLM:
+    def __init__(
+        self,
+        state: "NormalModel",
+        error: "InvWishartModel",
+        evolver: "TransitionModel",
+        observer: "TransitionModel",
+        numerics: "str" = "inverse",
+    ):
+
+        self.state = state
+        self.error = error
+        self.observer = observer
+        self.numerics = check_numerics(numerics)
+
+        weights = numpy.asarray(evolver.weights)
+        bias = numpy.asarray(evolver.bias)
+        P = weights.shape[-1]
+
+        # -- Horizon cache, seeded with the identity map
+        self.propagators: "Dict[int, Propagator]" = {
+            0: (numpy.eye(P), numpy.zeros_like(bias), numpy.zeros((P, P)))
+        }
+
+        # -- Doubling ladder: entry i maps 2**i steps ahead
+        self.doublings: "List[Propagator]" = [(weights, bias, evolver.covariance)]
+
+    def reorigin(self, state: "NormalModel", error: "InvWishartModel") -> "ForecastDLM":
+
+        # -- Propagators do not depend on the origin, so the caches are shared
+        forecaster = copy.copy(self)
+        forecaster.state = state
+        forecaster.error = error
+
+        return forecaster
+
+    def compose(self, first: "Propagator", second: "Propagator") -> "Propagator":
+
+        G1, c1, Q1 = first
+        G2, c2, Q2 = second
+
+        return G2 @ G1, G2 @ c1 + c2, G2 @ Q1 @ transpose(G2) + Q2
+
+    def doubling(self, level: "int") -> "Propagator":
+
+        while len(self.doublings) <= level:
+            last = self.doublings[-1]
+            self.doublings.append(self.compose(last, last))
+
+        return self.doublings[level]
+
+    def propagator(self, horizon: "int") -> "Propagator":
+
+        if horizon < 0:
+            raise BaseException(f"horizon={horizon} has to be non-negative")
+
+        if horizon in self.propagators:
+            return self.propagators[horizon]
+
+        # -- Extend the longest cached horizon by binary doubling steps
+        base = max(cached for cached in self.propagators if cached <= horizon)
+        propagator = self.propagators[base]
+        remaining = horizon - base
+        level = 0
+
+        while remaining > 0:
+            if remaining & 1:
+                propagator = self.compose(propagator, self.doubling(level))
+            remaining >>= 1
+            level += 1
+
+        self.propagators[horizon] = propagator
+
+        return propagator
+
+    def state_at(self, horizon: "int") -> "NormalModel":
+
+        G, c, Q = self.propagator(horizon)
+
+        mean = G @ self.state.mean + c
+        covariance = G @ self.state.covariance @ transpose(G) + Q
+
+        return NormalModel(mean, covariance)
+
+    def space_at(self, horizon: "int") -> "NormalModel":
+
+        joint_model = JointModel(self.state_at(horizon), self.observer, self.numerics)
+
+        return joint_model.mutate_normal()
+
+    def states(self, horizons: "Sequence[int]") -> "NormalModel":
+
+        states = [self.state_at(horizon) for horizon in horizons]
+
+        return NormalModel(
+            numpy.stack([state.mean for state in states]),
+            numpy.stack([state.covariance for state in states]),
+        )
+
+    def spaces(self, horizons: "Sequence[int]") -> "NormalModel":
+
+        spaces = [self.space_at(horizon) for horizon in horizons]
+
+        return NormalModel(
+            numpy.stack([space.mean for space in spaces]),
+            numpy.stack([space.covariance for space in spaces]),
+        )
+
+    def intervals(
+        self, horizons: "Sequence[int]", significance_level: "float"
+    ) -> "Tuple[NDArray, NDArray]":
+
+        spaces = self.spaces(horizons)
+        errors = interval_errors(
+            spaces.covariance.diagonal(axis1=-2, axis2=-1),
+            self.error.scale[None],
+            numpy.asarray([self.error.shape]),
+            significance_level,
+        )
+
+        return spaces.mean - errors, spaces.mean + errors
@@ -1,13 +1,59 @@
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+from numpy.typing import NDArray
+import pathlib
+import numpy
+
+from .objects import NormalModel
 from .memory import PrimeMemoryDLM
+from .forecast import ForecastDLM
+from .retention import RetentionDLM
 from .updater import UpdaterDLM
+from .checkpoint import (
+    MmapMode,
+    save_memory,
+    restore_memory,
+    load_config,
+    save_prime_memory,
+    load_prime_memory,
+)
 
 
 class ModellerDLM:
-    def __init__(self, prime_memory: "PrimeMemoryDLM"):
+    def __init__(
+        self,
+        prime_memory: "PrimeMemoryDLM",
+        storage: "str" = "dict",
+        numerics: "str" = "inverse",
+        steady_tolerance: "Optional[float]" = None,
+        lazy_spaces: "bool" = False,
+        retention: "Optional[RetentionDLM]" = None,
+        layout: "str" = "dense",
+        information: "Optional[bool]" = None,
+    ):
         self.prime_memory = prime_memory
-        self.memory = UpdaterDLM(prime_memory.S, prime_memory.P)
+        self.memory = UpdaterDLM(
+            prime_memory.S,
+            prime_memory.P,
+            storage,
+            numerics,
+            steady_tolerance,
+            lazy_spaces,
+            retention,
+            layout,
+            information,
+        )
+        self.forecast_cache: "Optional[ForecastDLM]" = None
+
+        # -- Directory and filled masks of the last checkpoint in this pass
+        self.checkpointed: "Optional[Tuple[str, Dict[str, NDArray]]]" = None
 
-    def forward(self):
+    def forward(
+        self,
+        start: "int" = 0,
+        checkpoint_directory: "Optional[str]" = None,
+        checkpoint_every: "int" = 0,
+        callback: "Optional[Callable[[int], None]]" = None,
+    ):
 
         observed_period = self.prime_memory.S
         primordial_model = self.prime_memory.primordial_model
@@ -16,12 +62,22 @@ class ModellerDLM:
         observers = self.prime_memory.observers
         observations = self.prime_memory.observations
 
-        self.memory.filtered_states.set_at_time(0, primordial_model)
-        self.memory.wisharts.set_at_time(0, primordial_error)
+        self.forecast_cache = None
+        self.checkpointed = None
+
+        # -- Refiltering history the last backward pass conditioned on voids it
+        smoothed_period = self.memory.smoothed_period
+        if smoothed_period is not None and start < smoothed_period:
+            self.memory.smoothed_period = None
 
-        for time in range(observed_period):
+        if start == 0:
+            self.memory.filtered_states.set_at_time(0, primordial_model)
+            self.memory.wisharts.set_at_time(0, primordial_error)
+            self.memory.steady.reset_forward()
 
-            observation = observations[:, :, time]
+        for time in range(start, observed_period):
+
+            observation = observations[..., time]
             evolver = evolvers.get_from_time(0)
             observer = observers.get_from_time(0)
 
@@ -29,21 +85,62 @@ class ModellerDLM:
             self.memory.observe_evolved(time, observer)
             self.memory.filter(time, observation)
             self.memory.observe_filtered(time, observer)
+            self.memory.settle(time)
+
+            if callback is not None:
+                callback(time + 1)
 
-    def backward(self):
+            if checkpoint_directory is not None and checkpoint_every > 0:
+                if (time + 1) % checkpoint_every == 0 or time + 1 == observed_period:
+                    self.memory.flush()
+                    self.checkpoint(checkpoint_directory)
+
+        self.memory.flush()
+
+    def backward(self, window: "Optional[int]" = None):
 
         observed_period = self.prime_memory.S
         observers = self.prime_memory.observers
 
+        if not self.memory.retention.smoothers:
+            raise BaseException("Smoothing needs retained smoothers")
+
+        smoothed_period = self.memory.smoothed_period
+
+        if window is None or window >= observed_period:
+            window = observed_period
+        elif smoothed_period is None or smoothed_period < observed_period - window:
+            raise BaseException(
+                f"Smoothed entries before the window of {window} are missing or "
+                f"stale for S={observed_period}, run a full backward pass first"
+            )
+
+        self.checkpointed = None
+
         filtered_state = self.memory.filtered_states.get_from_time(observed_period)
         self.memory.smoothed_states.set_at_time(observed_period, filtered_state)
+        self.memory.steady.reset_backward()
 
-        for time in range(observed_period):
+        for time in range(min(window, observed_period)):
 
             observer = observers.get_from_time(0)
 
             self.memory.observe_smoothed(time, observer)
             self.memory.smoothen(time)
+            self.memory.settle_smoothed(time)
+
+        # -- Entries before a window keep smoothing over an earlier history
+        if window == observed_period:
+            self.memory.smoothed_from = 0
+        else:
+            self.memory.observe_smoothed(window, observers.get_from_time(0))
+            if smoothed_period == observed_period:
+                smoothed_from = min(self.memory.smoothed_from, observed_period - window)
+            else:
+                smoothed_from = observed_period - window
+            self.memory.smoothed_from = smoothed_from
+
+        self.memory.smoothed_period = observed_period
 
     def beyond(self):
 
@@ -52,11 +149,12 @@ class ModellerDLM:
         evolvers = self.prime_memory.evolvers
         observers = self.prime_memory.observers
 
+        self.checkpointed = None
+
         filtered_state = self.memory.filtered_states.get_from_time(observed_period)
         self.memory.predicted_states.set_at_time(observed_period, filtered_state)
 
-        filtered_space = self.memory.filtered_spaces.get_from_time(observed_period)
-        self.memory.predicted_spaces.set_at_time(observed_period, filtered_space)
+        self.memory.observe_predicted(-1, observers.get_from_time(0))
 
         for time in range(predicted_period):
 
@@ -66,6 +164,107 @@ class ModellerDLM:
             self.memory.predict(time, evolver)
             self.memory.observe_predicted(time, observer)
 
+    def forecaster(self) -> "ForecastDLM":
+
+        # -- Horizons stay cached until the next forward pass moves the origin
+        if self.forecast_cache is None:
+            observed_period = self.prime_memory.S
+            self.forecast_cache = ForecastDLM(
+                self.memory.filtered_states.get_from_time(observed_period),
+                self.memory.wisharts.get_from_time(observed_period),
+                self.prime_memory.evolvers.get_from_time(0),
+                self.prime_memory.observers.get_from_time(0),
+                self.memory.numerics,
+            )
+
+        return self.forecast_cache
+
+    def forecast(self, horizons: "Sequence[int]") -> "NormalModel":
+        return self.forecaster().spaces(horizons)
+
+    def log_likelihoods(self) -> "NDArray":
+        return self.memory.log_likelihoods.arrays(1, self.prime_memory.S + 1)
+
+    def log_likelihood(self) -> "NDArray":
+        return self.log_likelihoods().sum(axis=0)
+
+    def append(self, observations: "NDArray", forecast: "bool" = True):
+
+        amount = observations.shape[-1]
+        observed_period = self.prime_memory.S
+        history = self.prime_memory.observations
+
+        self.prime_memory.observations = numpy.concatenate(
+            [
+                history[..., :observed_period],
+                observations,
+                history[..., observed_period + amount :],
+            ],
+            axis=-1,
+        )
+        self.prime_memory.S = observed_period + amount
+        self.memory.extend(amount)
+
+        self.forward(start=observed_period)
+
+        if forecast:
+            self.beyond()
+
+    def filtered_time(self) -> "int":
+
+        # -- Forward resumes from the last flushed state and scale
+        times = [
+            time
+            for time in self.memory.filtered_states.times()
+            if self.memory.wisharts.contains(time)
+        ]
+
+        return max(times, default=0)
+
+    def config(self) -> "Dict[str, Any]":
+        return {
+            "numerics": self.memory.numerics,
+            "steady_tolerance": self.memory.steady.tolerance,
+            "lazy_spaces": self.memory.lazy_spaces,
+            "retention": vars(self.memory.retention),
+            "layout": self.memory.layout,
+            "information": self.memory.information,
+        }
+
+    def checkpoint(self, directory: "str"):
+
+        path = pathlib.Path(directory)
+
+        # -- Prime memory is fixed within a pass, so later saves only add rows
+        saved = None
+        if self.checkpointed is not None and self.checkpointed[0] == str(path):
+            saved = self.checkpointed[1]
+        else:
+            save_prime_memory(self.prime_memory, str(path / "prime"))
+
+        filled = save_memory(self.memory, str(path / "memory"), saved, self.config())
+        self.checkpointed = (str(path), filled)
+
+    @staticmethod
+    def restore(
+        directory: "str",
+        storage: "str" = "tensor",
+        mode: "MmapMode" = "c",
+        **overrides: "Any",
+    ) -> "ModellerDLM":
+
+        path = pathlib.Path(directory)
+        prime_memory = load_prime_memory(str(path / "prime"), mode)
+
+        # -- Settings saved with the checkpoint apply unless overridden
+        config = {**load_config(str(path / "memory")), **overrides}
+        modeller = ModellerDLM(prime_memory, storage, **config)
+
+        observer = prime_memory.observers.get_from_time(0)
+        restore_memory(modeller.memory, str(path / "memory"), mode, observer)
+
+        return modeller
+
     def get_memory(self):
         return self.memory
 
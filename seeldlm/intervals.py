@@ -0,0 +1,112 @@
+from typing import Optional, Tuple
+from numpy.typing import NDArray
+import numpy
+
+from .memory import MemoryDLM
+from .containers import NormalContainer, InvWishartContainer, t_quantiles
+
+
+def interval_errors(
+    row_variances: "NDArray",
+    scales: "NDArray",
+    shapes: "NDArray",
+    significance_level: "float",
+) -> "NDArray":
+
+    column_variances = scales.diagonal(axis1=-2, axis2=-1)
+    shapes = numpy.asarray(shapes, float)
+    quantiles = t_quantiles(significance_level, shapes)
+
+    extra = (1,) * (row_variances.ndim)
+    shapes = shapes.reshape(shapes.shape + extra)
+    quantiles = quantiles.reshape(quantiles.shape + extra)
+
+    products = row_variances[..., :, None] * column_variances[..., None, :]
+    return quantiles * numpy.sqrt(products / shapes)
+
+
+def credible_errors(
+    normal_container: "NormalContainer",
+    wishart_container: "InvWishartContainer",
+    start: "int",
+    end: "int",
+    significance_level: "float",
+    error_time: "Optional[int]" = None,
+) -> "NDArray":
+
+    # -- Forecasts share the final error, observed times pair up one to one
+    if error_time is None:
+        error_start, error_end = start, end
+    else:
+        error_start, error_end = error_time, error_time + 1
+
+    return interval_errors(
+        normal_container.variances(start, end),
+        wishart_container.scales(error_start, error_end),
+        wishart_container.shape(error_start, error_end),
+        significance_level,
+    )
+
+
+def credible_intervals(
+    normal_container: "NormalContainer",
+    wishart_container: "InvWishartContainer",
+    start: "int",
+    end: "int",
+    significance_level: "float",
+    error_time: "Optional[int]" = None,
+) -> "Tuple[NDArray, NDArray]":
+
+    means = normal_container.means(start, end)
+    errors = credible_errors(
+        normal_container,
+        wishart_container,
+        start,
+        end,
+        significance_level,
+        error_time,
+    )
+
+    return means - errors, means + errors
+
+
+class IntervalDLM:
+    def __init__(self, memory: "MemoryDLM"):
+        self.memory = memory
+
+    def filtered(self, significance_level: "float") -> "Tuple[NDArray, NDArray]":
+        return credible_intervals(
+            self.memory.filtered_spaces,
+            self.memory.wisharts,
+            1,
+            self.memory.S + 1,
+            significance_level,
+        )
+
+    def smoothed(self, significance_level: "float") -> "Tuple[NDArray, NDArray]":
+        return credible_intervals(
+            self.memory.smoothed_spaces,
+            self.memory.wisharts,
+            1,
+            self.memory.S + 1,
+            significance_level,
+        )
+
+    def evolved(self, significance_level: "float") -> "Tuple[NDArray, NDArray]":
+        return credible_intervals(
+            self.memory.evolved_spaces,
+            self.memory.wisharts,
+            1,
+            self.memory.S + 1,
+            significance_level,
+        )
+
+    def predicted(self, significance_level: "float") -> "Tuple[NDArray, NDArray]":
+        return credible_intervals(
+            self.memory.predicted_spaces,
+            self.memory.wisharts,
+            self.memory.S,
+            self.memory.S + self.memory.P + 1,
+            significance_level,
+            self.memory.S,
+        )
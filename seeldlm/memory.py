@@ -1,11 +1,17 @@
 from numpy.typing import NDArray
 
+from typing import Optional, Tuple
+
 from .objects import NormalModel, InvWishartModel
+from .retention import RetentionDLM
 from .containers import (
     NormalContainer,
     InvWishartContainer,
     TransitionContainer,
     ArrayContainer,
+    ModelContainer,
+    ContainerFactory,
+    check_layout,
 )
 
 
@@ -37,35 +43,126 @@ class PrimeMemoryDLM:
 
 
 class MemoryDLM:
-    def __init__(self, observed_period: "int", predicted_period: "int"):
+    def __init__(
+        self,
+        observed_period: "int",
+        predicted_period: "int",
+        storage: "str" = "dict",
+        lazy_spaces: "bool" = False,
+        retention: "Optional[RetentionDLM]" = None,
+        layout: "str" = "dense",
+    ):
+
+        if retention is None:
+            retention = RetentionDLM.full()
+
+        if lazy_spaces and not retention.dense_history():
+            raise BaseException("Lazy spaces need the full forward state history")
 
         S = observed_period
         P = predicted_period
 
         self.S = S
         self.P = P
+        self.storage = storage
+        self.lazy_spaces = lazy_spaces
+        self.retention = retention
+        self.layout = check_layout(layout)
+
+        # -- States feed later steps, so they are only ever packed exactly
+        self.state_layout = "dense" if layout == "dense" else "packed"
+
+        factory = ContainerFactory(storage)
+        self.factory = factory
+
+        # -- Sparse or means-only histories are not worth preallocating
+        history = factory if retention.dense_history() else ContainerFactory("dict")
 
         # -- Space Models
-        self.filtered_states: "NormalContainer" = NormalContainer(0, S + 1)
-        self.evolved_states: "NormalContainer" = NormalContainer(1, S + 1)
-        self.smoothed_states: "NormalContainer" = NormalContainer(0, S + 1)
-        self.predicted_states: "NormalContainer" = NormalContainer(S, S + P + 1)
+        self.filtered_states: "NormalContainer" = history.normal(
+            0, S + 1, self.state_layout
+        )
+        self.evolved_states: "NormalContainer" = history.normal(
+            1, S + 1, self.state_layout
+        )
+        self.smoothed_states: "NormalContainer" = factory.normal(
+            0, S + 1, self.state_layout
+        )
+        self.predicted_states: "NormalContainer" = factory.normal(
+            S, S + P + 1, self.state_layout
+        )
 
         # -- Space Models
-        self.filtered_spaces: "NormalContainer" = NormalContainer(1, S + 1)
-        self.evolved_spaces: "NormalContainer" = NormalContainer(1, S + 1)
-        self.smoothed_spaces: "NormalContainer" = NormalContainer(1, S + 1)
-        self.predicted_spaces: "NormalContainer" = NormalContainer(S, S + P + 1)
+        self.filtered_spaces: "NormalContainer" = history.space(
+            1, S + 1, self.filtered_states, lazy_spaces, layout
+        )
+        self.evolved_spaces: "NormalContainer" = history.normal(
+            1, S + 1, self.state_layout
+        )
+        self.smoothed_spaces: "NormalContainer" = factory.space(
+            1, S + 1, self.smoothed_states, lazy_spaces, layout
+        )
+        self.predicted_spaces: "NormalContainer" = factory.space(
+            S, S + P + 1, self.predicted_states, lazy_spaces, layout
+        )
 
         # -- Transitions
-        self.smoothers: "TransitionContainer" = TransitionContainer(1, S + 1)
-        self.filterers: "TransitionContainer" = TransitionContainer(1, S + 1)
+        self.smoothers: "TransitionContainer" = factory.transition(1, S + 1)
+        self.filterers: "TransitionContainer" = history.transition(1, S + 1)
 
         # -- Error Matrix
-        self.wisharts: "InvWishartContainer" = InvWishartContainer(0, S + 1)
+        self.wisharts: "InvWishartContainer" = history.wishart(0, S + 1)
+
+        # -- Likelihoods
+        self.log_likelihoods: "ArrayContainer" = factory.array(1, S + 1)
 
         # -- EM Estimates
-        self.state_em: "ArrayContainer" = ArrayContainer(1, S + 1)
-        self.space_em: "ArrayContainer" = ArrayContainer(1, S + 1)
-        self.scale_em: "NDArray" = ArrayContainer(0, 1)
-        self.primordial_em: "NDArray" = ArrayContainer(0, 1)
+        self.state_em: "ArrayContainer" = factory.array(1, S + 1)
+        self.space_em: "ArrayContainer" = factory.array(1, S + 1)
+        self.scale_em: "ArrayContainer" = factory.array(0, 1)
+        self.primordial_em: "ArrayContainer" = factory.array(0, 1)
+
+        # -- Observed period of the last backward pass
+        self.smoothed_period: "Optional[int]" = None
+
+        # -- Smoothed entries before this time condition on a shorter history
+        self.smoothed_from: "int" = 0
+
+    def extend(self, amount: "int"):
+
+        S = self.S + amount
+        P = self.P
+        factory = self.factory
+
+        # -- Forward quantities keep their history and grow
+        containers: "Tuple[ModelContainer, ...]" = (
+            self.filtered_states,
+            self.evolved_states,
+            self.filtered_spaces,
+            self.evolved_spaces,
+            self.smoothers,
+            self.filterers,
+            self.wisharts,
+            self.log_likelihoods,
+            self.smoothed_states,
+            self.smoothed_spaces,
+        )
+        for container in containers:
+            container.resize(container.start, S + 1)
+
+        # -- Smoothed history stays as an approximation until a backward pass
+        self.smoothed_from = S + 1
+
+        # -- EM estimates condition on the whole history, so they go stale
+        self.state_em = factory.array(1, S + 1)
+        self.space_em = factory.array(1, S + 1)
+        self.scale_em = factory.array(0, 1)
+        self.primordial_em = factory.array(0, 1)
+
+        # -- Predictions restart from the new end
+        self.predicted_states = factory.normal(S, S + P + 1, self.state_layout)
+        self.predicted_spaces = factory.space(
+            S, S + P + 1, self.predicted_states, self.lazy_spaces, self.layout
+        )
+
+        self.S = S
@@ -1,16 +1,30 @@
 from numpy.typing import NDArray
-from numpy import block as block_matrix
+from numpy import asarray, concatenate
 from typing import Tuple
 
 from .normal import NormalModel
 from .transition import TransitionModel
+from .utils import (
+    transpose,
+    symmetrise,
+    check_numerics,
+    lower_factor,
+    factor_inverse,
+    factor_log_determinant,
+)
 
 
 class JointModel:
-    def __init__(self, normal: "NormalModel", transition: "TransitionModel"):
+    def __init__(
+        self,
+        normal: "NormalModel",
+        transition: "TransitionModel",
+        numerics: "str" = "inverse",
+    ):
 
         self.normal = normal
         self.transition = transition
+        self.numerics = check_numerics(numerics)
 
     def give_normal(self) -> "NormalModel":
         return self.normal
@@ -26,11 +40,21 @@ class JointModel:
         A = self.transition.weights
         V = self.transition.covariance
 
-        mean: "NDArray" = B + A.dot(M)
-        covariance: "NDArray" = V + A.dot(S).dot(A.T)
+        mean: "NDArray" = B + A @ M
+        covariance: "NDArray" = V + A @ S @ transpose(A)
 
         return NormalModel(mean, covariance)
 
+    def mutate_normal_steady(self, steady: "NormalModel") -> "NormalModel":
+
+        M = self.normal.mean
+        B = self.transition.bias
+        A = self.transition.weights
+
+        mean: "NDArray" = B + A @ M
+
+        return steady.share_covariance(mean)
+
     def mutate_joint_model(self) -> "JointModel":
 
         normal = self.mutate_normal()
@@ -38,14 +62,65 @@ class JointModel:
         S = self.normal.covariance
         A = self.transition.weights
 
-        inv_covariance = normal.invert_covariance()
-        weights: "NDArray" = S.dot(A.T).dot(inv_covariance)
-        bias: "NDArray" = M - weights.dot(normal.mean)
-        variation: "NDArray" = S - weights.dot(normal.covariance).dot(weights.T)
+        if self.numerics == "cholesky":
+            whitened = normal.whiten(A @ S)
+            weights: "NDArray" = transpose(normal.solve_whitened(whitened))
+            variation: "NDArray" = S - transpose(whitened) @ whitened
+        else:
+            inv_covariance = normal.invert_covariance()
+            weights = S @ transpose(A) @ inv_covariance
+            variation = S - weights @ normal.covariance @ transpose(weights)
+
+        bias: "NDArray" = M - weights @ normal.mean
+
+        transition = TransitionModel(bias, weights, variation)
+
+        return JointModel(normal, transition, self.numerics)
+
+    def mutate_joint_model_information(self, covariance: "bool" = True) -> "JointModel":
+
+        M = self.normal.mean
+        A = self.transition.weights
+
+        # -- Woodbury terms stand in for the (M, M) covariance unless it is kept
+        if covariance:
+            normal = self.mutate_normal()
+        else:
+            normal = NormalModel.mean_only(self.transition.bias + A @ M)
+
+        # -- Work with (P, P) precisions instead of inverting the (M, M) covariance
+        projected = self.transition.solve_covariance(asarray(A))  # (M, P)
+        precision = self.normal.invert_covariance() + transpose(A) @ projected
+        factor = lower_factor(precision)
+        variation: "NDArray" = symmetrise(factor_inverse(factor))
+        weights: "NDArray" = variation @ transpose(projected)
+
+        bias: "NDArray" = M - weights @ normal.mean
+
+        # -- Matrix determinant lemma for the log-determinant of the covariance
+        normal.log_det = (
+            self.transition.log_determinant()
+            + self.normal.log_determinant()
+            + factor_log_determinant(factor)
+        )
+        normal.woodbury = (self.transition, projected, variation)
 
         transition = TransitionModel(bias, weights, variation)
 
-        return JointModel(normal, transition)
+        return JointModel(normal, transition, self.numerics)
+
+    def mutate_joint_model_steady(self, steady: "JointModel") -> "JointModel":
+
+        normal = self.mutate_normal_steady(steady.normal)
+        M = self.normal.mean
+        weights = steady.transition.weights
+        variation = steady.transition.covariance
+
+        bias: "NDArray" = M - weights @ normal.mean
+
+        transition = TransitionModel(bias, weights, variation)
+
+        return JointModel(normal, transition, self.numerics)
 
     def generate_normal(self) -> "NormalModel":
 
@@ -54,20 +129,39 @@ class JointModel:
         M = self.normal.mean
         S = self.normal.covariance
         A = self.transition.weights
-        alt_covariance = S.dot(A.T)
-
-        new_mean = block_matrix([[new_normal.mean], [M]])
-        new_covariance = block_matrix(
-            [[new_normal.covariance, alt_covariance.T], [alt_covariance, S]]
+        alt_covariance = S @ transpose(A)
+
+        new_mean = concatenate([new_normal.mean, M], axis=-2)
+        new_covariance = concatenate(
+            [
+                concatenate(
+                    [new_normal.covariance, transpose(alt_covariance)], axis=-1
+                ),
+                concatenate([alt_covariance, S], axis=-1),
+            ],
+            axis=-2,
         )
 
         return NormalModel(new_mean, new_covariance)
 
     def transition_transumer(
-        self,
+        self, information: "bool" = False, covariance: "bool" = True
+    ) -> "Tuple[NormalModel, TransitionModel]":
+
+        if information:
+            joint_model = self.mutate_joint_model_information(covariance)
+        else:
+            joint_model = self.mutate_joint_model()
+        model = joint_model.give_normal()
+        transition = joint_model.give_transition()
+
+        return model, transition
+
+    def transition_transumer_steady(
+        self, steady: "JointModel"
     ) -> "Tuple[NormalModel, TransitionModel]":
 
-        joint_model = self.mutate_joint_model()
+        joint_model = self.mutate_joint_model_steady(steady)
         model = joint_model.give_normal()
         transition = joint_model.give_transition()
 
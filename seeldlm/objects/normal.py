@@ -1,8 +1,15 @@
-from typing import Optional
+from typing import Any, Optional, Tuple, cast
 from numpy.typing import NDArray
-from numpy.linalg import inv as inverse_matrix
+import math
 
-from .utils import symmetrise
+from .utils import (
+    log_multigamma,
+    transpose,
+    lower_factor,
+    lower_solve,
+    factor_inverse,
+    factor_log_determinant,
+)
 from .wishart import InvWishartModel
 
 
@@ -11,40 +18,122 @@ class NormalModel:
         self.mean = mean
         self.covariance = covariance
         self.inv_covariance: "Optional[NDArray]" = None
+        self.factor: "Optional[NDArray]" = None
+        self.log_det: "Optional[NDArray]" = None
+        self.woodbury: "Optional[Tuple[Any, NDArray, NDArray]]" = None
+
+    @staticmethod
+    def mean_only(mean: "NDArray") -> "NormalModel":
+
+        # -- Retention can drop covariances, containers read None as not retained
+        return NormalModel(mean, cast("NDArray", None))
 
     def invert_covariance(self) -> "NDArray":
 
+        # -- The same factor later gives the log-determinant at no extra cost
         if self.inv_covariance is None:
-            self.inv_covariance = inverse_matrix(symmetrise(self.covariance))
+            self.inv_covariance = factor_inverse(self.factorise_covariance())
 
         return self.inv_covariance
 
+    def share_covariance(self, mean: "NDArray") -> "NormalModel":
+
+        normal = NormalModel(mean, self.covariance)
+        normal.inv_covariance = self.inv_covariance
+        normal.factor = self.factor
+        normal.log_det = self.log_det
+        normal.woodbury = self.woodbury
+
+        return normal
+
+    def factorise_covariance(self) -> "NDArray":
+
+        if self.factor is None:
+            self.factor = lower_factor(self.covariance)
+
+        return self.factor
+
+    def log_determinant(self) -> "NDArray":
+
+        if self.log_det is None:
+            self.log_det = factor_log_determinant(self.factorise_covariance())
+
+        return self.log_det
+
+    def whiten(self, array: "NDArray") -> "NDArray":
+        return lower_solve(self.factorise_covariance(), array)
+
+    def solve_whitened(self, array: "NDArray") -> "NDArray":
+        return lower_solve(self.factorise_covariance(), array, trans=True)
+
     def update_wishart(
-        self, wishart: "InvWishartModel", observation: "NDArray"
+        self,
+        wishart: "InvWishartModel",
+        observation: "NDArray",
+        numerics: "str" = "inverse",
     ) -> "InvWishartModel":
 
         error = self.mean - observation  # (P, N)
-        inv_covariance = self.invert_covariance()  # (P, P)
 
-        scale = wishart.scale + (error.T).dot(inv_covariance).dot(error)  # (N, N)
-        shape = wishart.shape + self.mean.shape[0]  # int
+        if self.woodbury is not None:
+            noise, projected, variation = self.woodbury
+            reduced = transpose(projected) @ error
+            spread = transpose(error) @ noise.solve_covariance(error)  # (N, N)
+            scale = wishart.scale + spread - transpose(reduced) @ variation @ reduced
+        elif numerics == "cholesky":
+            whitened = self.whiten(error)  # (P, N)
+            scale = wishart.scale + transpose(whitened) @ whitened  # (N, N)
+        else:
+            inv_covariance = self.invert_covariance()  # (P, P)
+            scale = wishart.scale + transpose(error) @ inv_covariance @ error  # (N, N)
+        shape = wishart.shape + self.mean.shape[-2]  # int
 
         return InvWishartModel(scale, shape)
 
+    def predictive_log_density(
+        self, prior: "InvWishartModel", posterior: "InvWishartModel"
+    ) -> "NDArray":
+
+        M, N = self.mean.shape[-2:]
+        n = prior.shape
+
+        constant = (
+            log_multigamma((n + M) / 2, N)
+            - log_multigamma(n / 2, N)
+            - M * N / 2 * math.log(math.pi)
+        )
+
+        log_density = (
+            constant
+            - N / 2 * self.log_determinant()
+            + n / 2 * prior.log_determinant()
+            - (n + M) / 2 * posterior.log_determinant()
+        )
+
+        return log_density
+
     def transform(self, matrix: "NDArray") -> "NormalModel":
-        new_mean = matrix.dot(self.mean)
-        new_covariance = matrix.dot(self.covariance).dot(matrix.T)
+        new_mean = matrix @ self.mean
+        new_covariance = matrix @ self.covariance @ transpose(matrix)
         return NormalModel(new_mean, new_covariance)
 
     def derive_row_covariance_em_estimate(
-        self, true_normal: "NormalModel", true_wishart: "InvWishartModel"
+        self,
+        true_normal: "NormalModel",
+        true_wishart: "InvWishartModel",
+        numerics: "str" = "inverse",
     ) -> "NDArray":
 
-        inv_scale = true_wishart.invert_scale()
-        constant = true_wishart.shape / true_wishart.scale.shape[0]
+        constant = true_wishart.shape / true_wishart.scale.shape[-1]
+        difference = true_normal.mean - self.mean
+
+        if numerics == "cholesky":
+            whitened = true_wishart.whiten(transpose(difference))
+            spread = transpose(whitened) @ whitened
+        else:
+            inv_scale = true_wishart.invert_scale()
+            spread = difference @ inv_scale @ transpose(difference)
 
-        em_estimate = true_normal.covariance + constant * (
-            true_normal.mean - self.mean
-        ).dot(inv_scale).dot((true_normal.mean - self.mean).T)
+        em_estimate = true_normal.covariance + constant * spread
 
         return em_estimate
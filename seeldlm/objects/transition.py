@@ -1,6 +1,14 @@
 from numpy.typing import NDArray
+from numpy import zeros
+from typing import List, Optional, Tuple
 
 from .normal import NormalModel
+from .utils import (
+    block_ranges,
+    lower_factor,
+    factor_inverse,
+    factor_log_determinant,
+)
 
 
 class TransitionModel:
@@ -14,6 +22,44 @@ class TransitionModel:
         self.bias = bias
         self.weights = weights
         self.covariance = covariance
+        self.precision: "Optional[List[Tuple[int, int, NDArray]]]" = None
+        self.diagonal_precision: "Optional[NDArray]" = None
+        self.log_det: "Optional[NDArray]" = None
+
+    def invert_blocks(self) -> "List[Tuple[int, int, NDArray]]":
+
+        # -- Invert the covariance block by block, once per transition
+        if self.precision is None:
+            ranges = block_ranges(self.covariance)
+            self.precision = []
+            self.log_det = zeros(())
+            for start, end in ranges:
+                factor = lower_factor(self.covariance[start:end, start:end])
+                self.precision.append((start, end, factor_inverse(factor)))
+                self.log_det = self.log_det + factor_log_determinant(factor)
+            if all(end - start == 1 for start, end in ranges):
+                self.diagonal_precision = 1 / self.covariance.diagonal()
+
+        return self.precision
+
+    def log_determinant(self) -> "NDArray":
+        self.invert_blocks()
+        if self.log_det is None:
+            raise BaseException("Covariance blocks were not inverted")
+        return self.log_det
+
+    def solve_covariance(self, array: "NDArray") -> "NDArray":
+
+        precision = self.invert_blocks()
+
+        if self.diagonal_precision is not None:
+            return self.diagonal_precision[:, None] * array
+
+        solved = zeros(array.shape, dtype=array.dtype)
+        for start, end, block in precision:
+            solved[..., start:end, :] = block @ array[..., start:end, :]
+
+        return solved
 
     def observe(self, observation: "NDArray") -> "NormalModel":
 
@@ -21,6 +67,6 @@ class TransitionModel:
         A = self.weights
         V = self.covariance
 
-        mean = B + A.dot(observation)
+        mean = B + A @ observation
 
         return NormalModel(mean, V)
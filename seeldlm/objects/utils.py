@@ -1,6 +1,106 @@
 from numpy.typing import NDArray
+from numpy.linalg import cholesky
+from numpy import diagonal, log, arange, maximum, where, eye, broadcast_to
+from numpy import broadcast_shapes, empty, moveaxis, ndindex, result_type
+from typing import List, Tuple
+import math
+
+NUMERICS = ("inverse", "cholesky")
+
+
+def check_numerics(numerics: "str") -> "str":
+
+    if not numerics in NUMERICS:
+        raise BaseException(f"Unknown numerics {numerics}, expected one of {NUMERICS}")
+
+    return numerics
+
+
+def transpose(array: "NDArray") -> "NDArray":
+
+    return array.swapaxes(-1, -2)
 
 
 def symmetrise(array: "NDArray") -> "NDArray":
 
-    return (array + array.T) / 2
+    return (array + transpose(array)) / 2
+
+
+def lower_factor(array: "NDArray") -> "NDArray":
+
+    return cholesky(symmetrise(array))
+
+
+def block_ranges(matrix: "NDArray") -> "List[Tuple[int, int]]":
+
+    # -- A block closes where no earlier row reaches past the current one
+    nonzero = matrix != 0
+    rows = arange(matrix.shape[-1])
+    reach = where(nonzero.any(axis=-1), matrix.shape[-1] - 1, 0)
+    reach = reach - nonzero[:, ::-1].argmax(axis=-1)
+    reach = maximum.accumulate(maximum(reach, rows))
+
+    ranges: "List[Tuple[int, int]]" = []
+    start = 0
+    for row in rows[reach == rows].tolist():
+        ranges.append((start, row + 1))
+        start = row + 1
+
+    return ranges
+
+
+def log_multigamma(value: "float", dimension: "int") -> "float":
+
+    # -- Multivariate log gamma without pulling scipy.special in at import
+    return dimension * (dimension - 1) / 4 * math.log(math.pi) + sum(
+        math.lgamma(value + (1 - index) / 2) for index in range(1, dimension + 1)
+    )
+
+
+def factor_log_determinant(factor: "NDArray") -> "NDArray":
+
+    return 2 * log(diagonal(factor, axis1=-2, axis2=-1)).sum(axis=-1)
+
+
+def lower_solve(
+    factor: "NDArray", array: "NDArray", trans: "bool" = False
+) -> "NDArray":
+
+    from scipy.linalg import solve_triangular
+
+    if factor.ndim == 2 and array.ndim <= 2:
+        return solve_triangular(factor, array, lower=True, trans=int(trans))
+
+    if factor.ndim == 2:
+
+        # -- One factor for every batch, so batches ride along as extra columns
+        columns = moveaxis(array, -2, 0)
+        solved = solve_triangular(
+            factor, columns.reshape(factor.shape[0], -1), lower=True, trans=int(trans)
+        )
+        return moveaxis(solved.reshape(columns.shape), 0, -2)
+
+    batch = broadcast_shapes(factor.shape[:-2], array.shape[:-2])
+    factors = broadcast_to(factor, batch + factor.shape[-2:])
+    arrays = broadcast_to(array, batch + array.shape[-2:])
+
+    solved = empty(arrays.shape, result_type(factors, arrays))
+    for index in ndindex(*batch):
+        solved[index] = solve_triangular(
+            factors[index], arrays[index], lower=True, trans=int(trans)
+        )
+
+    return solved
+
+
+def factor_inverse(factor: "NDArray") -> "NDArray":
+
+    # -- Invert from an existing Cholesky factor instead of factorising again
+    if factor.ndim == 2:
+        from scipy.linalg import cho_solve
+
+        return cho_solve((factor, True), eye(factor.shape[-1]))
+
+    whitened = lower_solve(factor, broadcast_to(eye(factor.shape[-1]), factor.shape))
+
+    return transpose(whitened) @ whitened
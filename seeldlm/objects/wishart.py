@@ -1,8 +1,7 @@
 from typing import Optional
 from numpy.typing import NDArray
-from numpy.linalg import inv as inverse_matrix
 
-from .utils import symmetrise
+from .utils import lower_factor, lower_solve, factor_inverse, factor_log_determinant
 
 
 class InvWishartModel:
@@ -11,13 +10,32 @@ class InvWishartModel:
         self.scale = scale
         self.shape = shape
         self.inv_scale: "Optional[NDArray]" = None
+        self.factor: "Optional[NDArray]" = None
+        self.log_det: "Optional[NDArray]" = None
 
     def invert_scale(self) -> "NDArray":
 
         if self.inv_scale is None:
-            self.inv_scale = inverse_matrix(symmetrise(self.scale))
+            self.inv_scale = factor_inverse(self.factorise_scale())
 
         return self.inv_scale
 
+    def factorise_scale(self) -> "NDArray":
+
+        if self.factor is None:
+            self.factor = lower_factor(self.scale)
+
+        return self.factor
+
+    def log_determinant(self) -> "NDArray":
+
+        if self.log_det is None:
+            self.log_det = factor_log_determinant(self.factorise_scale())
+
+        return self.log_det
+
+    def whiten(self, array: "NDArray") -> "NDArray":
+        return lower_solve(self.factorise_scale(), array)
+
     def derive_scale_em_estimate(self, true_wishart: "InvWishartModel") -> "NDArray":
         return (self.shape / true_wishart.shape) * true_wishart.scale
@@ -0,0 +1,39 @@
+class RetentionDLM:
+    def __init__(
+        self,
+        smoothers: "bool" = True,
+        history: "bool" = True,
+        spaces: "bool" = True,
+        covariances: "bool" = True,
+    ):
+
+        # -- Compute and keep the smoother gains needed by backward passes
+        self.smoothers = smoothers
+
+        # -- Keep every forward step rather than only the latest one
+        self.history = history
+
+        # -- Project filtered states into observation space
+        self.spaces = spaces
+
+        # -- Keep covariances in the forward history, not only means
+        self.covariances = covariances
+
+    def dense_history(self) -> "bool":
+        return self.history and self.covariances
+
+    @staticmethod
+    def full() -> "RetentionDLM":
+        return RetentionDLM()
+
+    @staticmethod
+    def forward_only() -> "RetentionDLM":
+        return RetentionDLM(smoothers=False)
+
+    @staticmethod
+    def last_state_only() -> "RetentionDLM":
+        return RetentionDLM(smoothers=False, history=False, spaces=False)
+
+    @staticmethod
+    def means_only() -> "RetentionDLM":
+        return RetentionDLM(covariances=False)
@@ -0,0 +1,108 @@
+from typing import Dict, Sequence, Tuple
+from numpy.typing import NDArray
+import numpy
+
+from .objects import InvWishartModel
+from .objects.utils import symmetrise, transpose
+from .memory import MemoryDLM
+
+
+def psd_factor(covariance: "NDArray") -> "NDArray":
+
+    # -- Smoother variations can be singular, fall back to a symmetric root
+    try:
+        return numpy.linalg.cholesky(symmetrise(covariance))
+    except numpy.linalg.LinAlgError:
+        values, vectors = numpy.linalg.eigh(symmetrise(covariance))
+        return vectors * numpy.sqrt(numpy.clip(values, 0, None))[..., None, :]
+
+
+def stream_generator(seed: "int", stream: "int") -> "numpy.random.Generator":
+
+    # -- Streams are children of one seed, independent and reproducible
+    sequence = numpy.random.SeedSequence(seed, spawn_key=(stream,))
+
+    return numpy.random.default_rng(sequence)
+
+
+def sample_inverse_wishart(
+    wishart: "InvWishartModel", draws: "int", generator: "numpy.random.Generator"
+) -> "NDArray":
+
+    scale = numpy.asarray(wishart.scale)
+    N = scale.shape[-1]
+    shape = float(wishart.shape)
+
+    if shape <= N - 1:
+        raise BaseException(f"shape={shape} has to exceed {N - 1} to sample")
+
+    # -- Bartlett decomposition of the Wishart precision, one per draw
+    size = (draws,) + scale.shape[:-2]
+    lower = numpy.tril(generator.standard_normal(size + (N, N)), -1)
+    degrees = shape - numpy.arange(N)
+    diagonal = numpy.sqrt(generator.chisquare(degrees, size + (N,)))
+    lower[..., numpy.arange(N), numpy.arange(N)] = diagonal
+
+    precision_factor = numpy.linalg.cholesky(wishart.invert_scale())
+    root = precision_factor @ lower
+
+    return symmetrise(numpy.linalg.inv(root @ transpose(root)))
+
+
+class SamplerDLM:
+    def __init__(self, memory: "MemoryDLM", seed: "int" = 0):
+
+        if not memory.retention.smoothers:
+            raise BaseException("Sampling needs retained smoothers")
+
+        self.memory = memory
+        self.seed = seed
+
+    def sample(self, draws: "int", stream: "int" = 0) -> "Tuple[NDArray, NDArray]":
+
+        S = self.memory.S
+        generator = stream_generator(self.seed, stream)
+
+        # -- Column covariance from the final error, one per draw
+        columns = sample_inverse_wishart(
+            self.memory.wisharts.get_from_time(S), draws, generator
+        )
+        column_roots = transpose(numpy.linalg.cholesky(columns))
+
+        final = self.memory.filtered_states.get_from_time(S)
+        mean = numpy.asarray(final.mean)
+        states = numpy.empty((draws, S + 1) + mean.shape, dtype=float)
+
+        noise = generator.standard_normal((draws,) + mean.shape)
+        states[:, S] = mean + psd_factor(final.covariance) @ noise @ column_roots
+
+        # -- Steady runs share covariance arrays, so factor each only once;
+        # -- arrays are held alongside their factor so ids stay unique
+        factors: "Dict[int, Tuple[NDArray, NDArray]]" = dict()
+
+        for time in range(S, 0, -1):
+            smoother = self.memory.smoothers.get_from_time(time)
+
+            key = id(smoother.covariance)
+            if not key in factors:
+                factors[key] = (smoother.covariance, psd_factor(smoother.covariance))
+
+            noise = generator.standard_normal((draws,) + mean.shape)
+            states[:, time - 1] = (
+                smoother.bias
+                + smoother.weights @ states[:, time]
+                + factors[key][1] @ noise @ column_roots
+            )
+
+        return states, columns
+
+    def sample_streams(
+        self, draws: "int", streams: "Sequence[int]"
+    ) -> "Tuple[NDArray, NDArray]":
+
+        samples = [self.sample(draws, stream) for stream in streams]
+
+        return (
+            numpy.concatenate([states for states, _ in samples]),
+            numpy.concatenate([columns for _, columns in samples]),
+        )
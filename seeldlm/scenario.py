@@ -0,0 +1,119 @@
+from typing import List, Optional, Sequence, Tuple
+from numpy.typing import NDArray
+import numpy
+
+from .objects.utils import transpose
+from .memory import PrimeMemoryDLM, MemoryDLM
+from .sampler import psd_factor, sample_inverse_wishart, stream_generator
+
+# -- Draws per seed stream, so outputs do not depend on the chunk size
+STREAM_DRAWS = 256
+
+# -- (draws, generator) of one seed stream
+Stream = Tuple[int, "numpy.random.Generator"]
+
+
+class ScenarioDLM:
+    def __init__(
+        self, memory: "MemoryDLM", prime_memory: "PrimeMemoryDLM", seed: "int" = 0
+    ):
+        self.memory = memory
+        self.prime_memory = prime_memory
+        self.seed = seed
+
+        self.evolver = prime_memory.evolvers.get_from_time(0)
+        self.observer = prime_memory.observers.get_from_time(0)
+
+        # -- Noise roots are shared by every path and every step
+        self.evolver_root = psd_factor(self.evolver.covariance)
+        self.observer_root = psd_factor(self.observer.covariance)
+
+    def sample(self, draws: "int", stream: "int" = 0) -> "NDArray":
+        return self.sample_streams([(draws, stream_generator(self.seed, stream))])
+
+    def sample_streams(self, streams: "Sequence[Stream]") -> "NDArray":
+
+        S = self.memory.S
+        P = self.memory.P
+        draws = sum(size for size, _ in streams)
+
+        # -- Every stream draws its own block, the paths move on together
+        def normal(shape: "Tuple[int, ...]") -> "NDArray":
+            return numpy.concatenate(
+                [
+                    generator.standard_normal((size,) + shape)
+                    for size, generator in streams
+                ]
+            )
+
+        # -- One column covariance per path, held for the whole horizon
+        wishart = self.memory.wisharts.get_from_time(S)
+        columns = numpy.concatenate(
+            [
+                sample_inverse_wishart(wishart, size, generator)
+                for size, generator in streams
+            ]
+        )
+        column_roots = transpose(numpy.linalg.cholesky(columns))
+
+        final = self.memory.filtered_states.get_from_time(S)
+        mean = numpy.asarray(final.mean)
+        noise = normal(mean.shape)
+        states = mean + psd_factor(final.covariance) @ noise @ column_roots
+
+        observations = numpy.empty(
+            (draws, P) + mean.shape[:-2] + self.observer.bias.shape[-2:]
+        )
+
+        for step in range(P):
+            noise = normal(states.shape[1:])
+            states = (
+                self.evolver.bias
+                + self.evolver.weights @ states
+                + self.evolver_root @ noise @ column_roots
+            )
+
+            noise = normal(observations.shape[2:])
+            observations[:, step] = (
+                self.observer.bias
+                + self.observer.weights @ states
+                + self.observer_root @ noise @ column_roots
+            )
+
+        return observations
+
+    def generate(
+        self, draws: "int", chunk: "int" = 1024, path: "Optional[str]" = None
+    ) -> "NDArray":
+
+        P = self.memory.P
+        mean = numpy.asarray(
+            self.memory.filtered_states.get_from_time(self.memory.S).mean
+        )
+        shape = (draws, P) + mean.shape[:-2] + self.observer.bias.shape[-2:]
+
+        # -- Chunks are written straight to disk when a path is given
+        memmap: "Optional[numpy.memmap]" = None
+        if path is None:
+            scenarios: "NDArray" = numpy.empty(shape)
+        else:
+            scenarios = memmap = numpy.lib.format.open_memmap(path, "w+", float, shape)
+
+        # -- Chunks hold whole streams, stream i always covers the same draws
+        streams: "List[Stream]" = [
+            (min(STREAM_DRAWS, draws - start), stream_generator(self.seed, index))
+            for index, start in enumerate(range(0, draws, STREAM_DRAWS))
+        ]
+        per_chunk = max(1, chunk // STREAM_DRAWS)
+
+        start = 0
+        for first in range(0, len(streams), per_chunk):
+            block = streams[first : first + per_chunk]
+            end = start + sum(size for size, _ in block)
+            scenarios[start:end] = self.sample_streams(block)
+            start = end
+
+        if memmap is not None:
+            memmap.flush()
+
+        return scenarios
@@ -0,0 +1,227 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from numpy.typing import NDArray
+import json
+import os
+import pathlib
+import numpy
+
+from .memory import PrimeMemoryDLM
+from .funcs import ModellerDLM
+
+Builder = Callable[..., PrimeMemoryDLM]
+SCORES = ("likelihood", "forecast")
+
+# -- Per-process view of the shared observation cube
+WORKER_MEMORY: "Dict[str, Any]" = dict()
+
+
+def attach_observations(name: "str", shape: "Tuple[int, ...]", dtype: "str"):
+
+    shared_memory = SharedMemory(name=name)
+    observations: "NDArray" = numpy.ndarray(shape, dtype, buffer=shared_memory.buf)
+    observations.flags.writeable = False
+
+    WORKER_MEMORY["shared_memory"] = shared_memory
+    WORKER_MEMORY["observations"] = observations
+
+
+def score_modeller(modeller: "ModellerDLM", score: "str") -> "float":
+
+    prime_memory = modeller.get_prime_memory()
+    S, P = prime_memory.S, prime_memory.P
+
+    modeller.forward()
+
+    if score == "likelihood":
+        return float(modeller.log_likelihood())
+
+    modeller.beyond()
+    predicted = modeller.get_memory().predicted_spaces.means(S + 1, S + P + 1)
+    observed = numpy.moveaxis(prime_memory.observations[..., S : S + P], -1, 0)
+
+    return float(numpy.nanmean(numpy.abs(predicted - observed)))
+
+
+def evaluate_candidate(
+    builder: "Builder",
+    index: "int",
+    candidate: "Dict[str, Any]",
+    score: "str",
+    storage: "str",
+    numerics: "str",
+) -> "Tuple[int, float]":
+
+    prime_memory = builder(WORKER_MEMORY["observations"], **candidate)
+    modeller = ModellerDLM(prime_memory, storage, numerics)
+
+    return index, score_modeller(modeller, score)
+
+
+def candidate_key(
+    candidate: "Dict[str, Any]", score: "str", horizon: "Optional[int]"
+) -> "str":
+    entry = {"candidate": candidate, "score": score, "horizon": horizon}
+    return json.dumps(entry, sort_keys=True, default=repr)
+
+
+class SearchDLM:
+    def __init__(
+        self,
+        builder: "Builder",
+        observations: "NDArray",
+        candidates: "List[Dict[str, Any]]",
+        score: "str" = "likelihood",
+        journal: "Optional[str]" = None,
+        processes: "Optional[int]" = None,
+        storage: "str" = "tensor",
+        numerics: "str" = "inverse",
+    ):
+
+        if not score in SCORES:
+            raise BaseException(f"Unknown score {score}, expected one of {SCORES}")
+
+        self.builder = builder
+        self.observations = numpy.ascontiguousarray(observations)
+        self.candidates = candidates
+        self.score = score
+        self.journal = journal
+        self.processes = processes if processes is not None else os.cpu_count()
+        self.storage = storage
+        self.numerics = numerics
+
+        self.horizons: "List[Optional[int]]" = self.validate()
+
+        self.scores: "Dict[str, float]" = dict()
+        self.load_journal()
+
+    def validate(self) -> "List[Optional[int]]":
+
+        if self.score == "likelihood":
+            return [None for _ in self.candidates]
+
+        horizons: "List[Optional[int]]" = list()
+
+        for index, candidate in enumerate(self.candidates):
+            prime_memory = self.builder(self.observations, **candidate)
+            S, P = prime_memory.S, prime_memory.P
+            T = prime_memory.observations.shape[-1]
+            if P < 1 or T < S + P:
+                raise BaseException(
+                    f"Forecast score needs observations beyond S, candidate {index} "
+                    f"has S={S}, P={P} and {T} observed times"
+                )
+            horizons.append(P)
+
+        return horizons
+
+    def key(self, index: "int") -> "str":
+        return candidate_key(self.candidates[index], self.score, self.horizons[index])
+
+    def load_journal(self):
+
+        if self.journal is None or not pathlib.Path(self.journal).exists():
+            return
+
+        with open(self.journal) as file:
+            for line in file:
+                if line.strip():
+                    entry = json.loads(line)
+                    if entry.get("score_type") != self.score:
+                        raise BaseException(
+                            f"Journal {self.journal} was written with score "
+                            f"{entry.get('score_type')}, not {self.score}"
+                        )
+                    self.scores[entry["key"]] = entry["score"]
+
+    def record(self, index: "int", score: "float"):
+
+        key = self.key(index)
+        self.scores[key] = score
+
+        if self.journal is None:
+            return
+
+        with open(self.journal, "a") as file:
+            entry = {"key": key, "score_type": self.score, "score": score}
+            file.write(json.dumps(entry) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def pending(self) -> "List[int]":
+        return [
+            index
+            for index in range(len(self.candidates))
+            if not self.key(index) in self.scores
+        ]
+
+    def run(self) -> "List[Dict[str, Any]]":
+
+        pending = self.pending()
+
+        if len(pending) > 0:
+
+            shared_memory = SharedMemory(create=True, size=self.observations.nbytes)
+            view: "NDArray" = numpy.ndarray(
+                self.observations.shape,
+                self.observations.dtype,
+                buffer=shared_memory.buf,
+            )
+            view[...] = self.observations
+
+            initargs = (
+                shared_memory.name,
+                self.observations.shape,
+                self.observations.dtype.str,
+            )
+
+            try:
+                with ProcessPoolExecutor(
+                    self.processes,
+                    initializer=attach_observations,
+                    initargs=initargs,
+                ) as executor:
+
+                    futures = [
+                        executor.submit(
+                            evaluate_candidate,
+                            self.builder,
+                            index,
+                            self.candidates[index],
+                            self.score,
+                            self.storage,
+                            self.numerics,
+                        )
+                        for index in pending
+                    ]
+
+                    for future in as_completed(futures):
+                        index, score = future.result()
+                        self.record(index, score)
+
+            finally:
+                del view
+                shared_memory.close()
+                shared_memory.unlink()
+
+        return self.ranking()
+
+    def ranking(self) -> "List[Dict[str, Any]]":
+
+        table: "List[Dict[str, Any]]" = list()
+
+        for index, candidate in enumerate(self.candidates):
+            key = self.key(index)
+            if key in self.scores:
+                table.append(
+                    {"candidate": index, **candidate, self.score: self.scores[key]}
+                )
+
+        descending = self.score == "likelihood"
+        table.sort(key=lambda row: row[self.score], reverse=descending)
+
+        for rank, row in enumerate(table):
+            row["rank"] = rank + 1
+
+        return table
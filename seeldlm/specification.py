@@ -0,0 +1,252 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from numpy.typing import NDArray
+import hashlib
+import os
+import pathlib
+import tempfile
+import numpy
+
+from .components import (
+    Block,
+    BlockOperator,
+    ComponentFactory,
+    ModelCompiler,
+    clean_int_list,
+)
+
+COMPONENT_KINDS = (
+    "form_free",
+    "polynomial",
+    "harmonics",
+    "regression",
+    "autoregression",
+)
+
+
+def normalise_number(argument: "Any") -> "Any":
+
+    # -- Equal numbers must share a key and a digest, so 2, 2.0 and int64(2) agree
+    if isinstance(argument, (int, numpy.integer)):
+        return int(argument)
+
+    if isinstance(argument, (float, numpy.floating)):
+        value = float(argument)
+        return int(value) if value.is_integer() else value
+
+    return argument
+
+
+def freeze_argument(argument: "Any") -> "Any":
+
+    if isinstance(argument, numpy.ndarray):
+        return tuple(
+            normalise_number(value) for value in argument.astype(float).ravel().tolist()
+        )
+
+    return normalise_number(argument)
+
+
+def thaw_argument(argument: "Any") -> "Any":
+
+    if isinstance(argument, tuple):
+        return numpy.array(argument, dtype=float)
+
+    return argument
+
+
+class ModelSpecification:
+    def __init__(self, root_dimension: "int"):
+        self.M = root_dimension
+        self.components: "List[Tuple[str, Tuple[Any, ...]]]" = list()
+        self.vertices: "Dict[Tuple[int, int], Tuple[int, ...]]" = dict()
+
+    def add_component(self, kind: "str", *args: "Any") -> "ModelSpecification":
+
+        if not kind in COMPONENT_KINDS:
+            raise BaseException(f"Unknown component {kind}")
+
+        self.components.append((kind, tuple(freeze_argument(arg) for arg in args)))
+
+        return self
+
+    def set_vertex(
+        self, x: "int", y: "int", indices: "List[int]"
+    ) -> "ModelSpecification":
+
+        if x == y:
+            raise BaseException(f"x={x} and y={y} have to differ")
+
+        end = self.M if x == -1 else numpy.iinfo(int).max
+        self.vertices[(x, y)] = tuple(clean_int_list(indices, 0, end))
+
+        return self
+
+    def key(self) -> "Tuple[Any, ...]":
+        return (self.M, tuple(self.components), tuple(sorted(self.vertices.items())))
+
+    def digest(self) -> "str":
+        return hashlib.sha1(repr(self.key()).encode()).hexdigest()
+
+    def __hash__(self) -> "int":
+        return hash(self.key())
+
+    def __eq__(self, other: "object") -> "bool":
+        return isinstance(other, ModelSpecification) and self.key() == other.key()
+
+    def create_compiler(self) -> "ModelCompiler":
+
+        factory = ComponentFactory()
+        compiler = ModelCompiler(self.M)
+
+        components = [
+            getattr(factory, kind)(*[thaw_argument(arg) for arg in args])
+            for kind, args in self.components
+        ]
+        compiler.add_component_sequence(*components)
+
+        for (x, y), indices in self.vertices.items():
+            compiler.set_vertex(x, y, list(indices))
+
+        return compiler
+
+    def compile(self, cache: "Optional[ModelCache]" = None) -> "CompiledModel":
+
+        if cache is None:
+            cache = MODEL_CACHE
+
+        return cache.get(self)
+
+
+class CompiledModel:
+    def __init__(
+        self,
+        transition: "NDArray",
+        observation: "NDArray",
+        transition_operator: "BlockOperator",
+        observation_operator: "BlockOperator",
+    ):
+
+        self.P = transition.shape[0]
+        self.M = observation.shape[0]
+
+        # -- Dense matrices
+        self.transition = transition
+        self.observation = observation
+        self.transition_T = transition.T
+        self.observation_T = observation.T
+
+        # -- Structured operators
+        self.transition_operator = transition_operator
+        self.observation_operator = observation_operator
+
+        for array in (transition, observation):
+            array.flags.writeable = False
+
+    def save(self, path: "str"):
+
+        arrays: "Dict[str, NDArray]" = {
+            "transition": self.transition,
+            "observation": self.observation,
+        }
+
+        for name in ("transition", "observation"):
+            operator: "BlockOperator" = getattr(self, f"{name}_operator")
+            arrays[f"{name}_shape"] = numpy.array(operator.shape)
+            arrays[f"{name}_offsets"] = numpy.array(
+                [(row, column) for row, column, _ in operator.blocks], dtype=int
+            ).reshape(-1, 2)
+            for index, (_, _, block) in enumerate(operator.blocks):
+                arrays[f"{name}_block_{index}"] = block
+
+        numpy.savez(path, **arrays)
+
+    @staticmethod
+    def load(path: "str") -> "CompiledModel":
+
+        with numpy.load(path) as arrays:
+
+            operators: "List[BlockOperator]" = list()
+            for name in ("transition", "observation"):
+                offsets = arrays[f"{name}_offsets"]
+                blocks: "List[Block]" = [
+                    (int(row), int(column), arrays[f"{name}_block_{index}"])
+                    for index, (row, column) in enumerate(offsets)
+                ]
+                rows, columns = arrays[f"{name}_shape"]
+                operators.append(BlockOperator((int(rows), int(columns)), blocks))
+
+            return CompiledModel(
+                arrays["transition"], arrays["observation"], *operators
+            )
+
+
+class ModelCache:
+    def __init__(self, maxsize: "int" = 128, directory: "Optional[str]" = None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.models: "OrderedDict[Tuple[Any, ...], CompiledModel]" = OrderedDict()
+
+    def __len__(self) -> "int":
+        return self.models.__len__()
+
+    def path(self, specification: "ModelSpecification") -> "Optional[pathlib.Path]":
+
+        if self.directory is None:
+            return None
+
+        return pathlib.Path(self.directory) / f"{specification.digest()}.npz"
+
+    def get(self, specification: "ModelSpecification") -> "CompiledModel":
+
+        key = specification.key()
+
+        if key in self.models:
+            self.models.move_to_end(key)
+            return self.models[key]
+
+        path = self.path(specification)
+
+        if path is not None and path.exists():
+            model = CompiledModel.load(str(path))
+        else:
+            model = self.compile(specification)
+            if path is not None:
+                self.store(model, path)
+
+        self.models[key] = model
+        if len(self.models) > self.maxsize:
+            self.models.popitem(last=False)
+
+        return model
+
+    def store(self, model: "CompiledModel", path: "pathlib.Path"):
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # -- Readers in other processes only ever see a complete file
+        handle, temporary = tempfile.mkstemp(dir=path.parent, suffix=".npz")
+        os.close(handle)
+        try:
+            model.save(temporary)
+            os.replace(temporary, path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    def compile(self, specification: "ModelSpecification") -> "CompiledModel":
+
+        compiler = specification.create_compiler()
+
+        return CompiledModel(
+            compiler.compile_transition(),
+            compiler.compile_observation(),
+            compiler.compile_transition_operator(),
+            compiler.compile_observation_operator(),
+        )
+
+    def clear(self):
+        self.models.clear()
+
+
+MODEL_CACHE = ModelCache()
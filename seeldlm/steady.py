@@ -0,0 +1,53 @@
+from typing import Optional
+from numpy.typing import NDArray
+import numpy
+
+from .objects import NormalModel, JointModel
+
+
+class SteadyStateDLM:
+    def __init__(self, tolerance: "Optional[float]" = None):
+
+        self.tolerance = tolerance
+
+        # -- Forward templates, frozen once the filtered covariance settles
+        self.forward_time: "Optional[int]" = None
+        self.previous_covariance: "Optional[NDArray]" = None
+        self.evolved: "Optional[JointModel]" = None
+        self.evolved_state: "Optional[NormalModel]" = None
+        self.observed: "Optional[JointModel]" = None
+        self.filtered_space: "Optional[NormalModel]" = None
+
+        # -- Backward templates, frozen once the smoothed covariance settles
+        self.backward_settled: "bool" = False
+        self.smoothed_frozen: "bool" = False
+        self.smoothed_state: "Optional[NormalModel]" = None
+        self.smoothed_space: "Optional[NormalModel]" = None
+
+    def converged(self, previous: "NDArray", current: "NDArray") -> "bool":
+
+        if self.tolerance is None:
+            return False
+
+        difference = numpy.abs(current - previous).max()
+        magnitude = max(numpy.abs(current).max(), 1)
+
+        return bool(difference <= self.tolerance * magnitude)
+
+    def forward_frozen(self) -> "bool":
+        return self.forward_time is not None
+
+    def backward_frozen(self, time: "int") -> "bool":
+
+        if not self.backward_settled or self.forward_time is None:
+            return False
+
+        return time > self.forward_time
+
+    def reset_forward(self):
+        self.forward_time = None
+        self.previous_covariance = None
+
+    def reset_backward(self):
+        self.backward_settled = False
+        self.smoothed_frozen = False
@@ -0,0 +1,172 @@
+from collections import deque
+from typing import Deque, Optional
+from numpy.typing import NDArray
+
+from .objects import NormalModel, TransitionModel, JointModel, InvWishartModel
+from .updater import UpdaterDLM
+
+
+class StreamStepDLM:
+    def __init__(
+        self,
+        time: "int",
+        observation: "NDArray",
+        evolved_state: "NormalModel",
+        smoother: "TransitionModel",
+        evolved_space: "NormalModel",
+        filtered_state: "NormalModel",
+        prior_error: "InvWishartModel",
+        error: "InvWishartModel",
+        log_likelihood: "NDArray",
+    ):
+
+        self.time = time
+        self.observation = observation
+
+        # -- One-step predictive distributions
+        self.evolved_state = evolved_state
+        self.evolved_space = evolved_space
+        self.prior_error = prior_error
+
+        # -- Filtered distributions
+        self.filtered_state = filtered_state
+        self.error = error
+        self.log_likelihood = log_likelihood
+
+        # -- Backward transition
+        self.smoother = smoother
+
+
+class StreamDLM:
+    def __init__(
+        self,
+        primordial_model: "NormalModel",
+        primordial_error: "InvWishartModel",
+        evolver: "TransitionModel",
+        observer: "TransitionModel",
+        window: "int" = 1,
+        numerics: "str" = "inverse",
+        steady_tolerance: "Optional[float]" = None,
+        information: "Optional[bool]" = None,
+    ):
+
+        if window < 1:
+            raise BaseException(f"window={window} has to be positive")
+
+        self.evolver = evolver
+        self.observer = observer
+
+        # -- Single-step updates are shared with the batch modeller
+        self.updater = UpdaterDLM(
+            0,
+            0,
+            numerics=numerics,
+            steady_tolerance=steady_tolerance,
+            information=information,
+        )
+        self.updater.steady.previous_covariance = primordial_model.covariance
+        self.numerics = self.updater.numerics
+
+        # -- Current state
+        self.time = 0
+        self.filtered_state = primordial_model
+        self.error = primordial_error
+
+        # -- Bounded history
+        self.history: "Deque[StreamStepDLM]" = deque(maxlen=window)
+
+    def step(self, observation: "NDArray") -> "StreamStepDLM":
+
+        evolved_state, smoother = self.updater.evolution_step(
+            self.filtered_state, self.evolver
+        )
+        evolved_space, filterer = self.updater.observation_step(
+            evolved_state, self.observer
+        )
+        filtered_state, error, log_likelihood = self.updater.filter_step(
+            evolved_space, filterer, self.error, observation
+        )
+        self.updater.settle_step(self.time, filtered_state)
+
+        step = StreamStepDLM(
+            self.time + 1,
+            observation,
+            evolved_state,
+            smoother,
+            evolved_space,
+            filtered_state,
+            self.error,
+            error,
+            log_likelihood,
+        )
+
+        self.time += 1
+        self.filtered_state = filtered_state
+        self.error = error
+        self.history.append(step)
+
+        return step
+
+    def observe_filtered(self) -> "NormalModel":
+
+        joint_model = JointModel(self.filtered_state, self.observer, self.numerics)
+
+        return joint_model.mutate_normal()
+
+    def get_from_time(self, time: "int") -> "StreamStepDLM":
+
+        start = self.time - len(self.history) + 1
+        if not start <= time <= self.time:
+            raise BaseException(f"Set outside interval [{start},{self.time + 1})")
+
+        return self.history[time - start]
+
+
+class FixedLagDLM(StreamDLM):
+    def __init__(
+        self,
+        primordial_model: "NormalModel",
+        primordial_error: "InvWishartModel",
+        evolver: "TransitionModel",
+        observer: "TransitionModel",
+        lag: "int",
+        numerics: "str" = "inverse",
+        steady_tolerance: "Optional[float]" = None,
+        information: "Optional[bool]" = None,
+    ):
+        super().__init__(
+            primordial_model,
+            primordial_error,
+            evolver,
+            observer,
+            lag,
+            numerics,
+            steady_tolerance,
+            information,
+        )
+
+        self.lag = lag
+        self.lagged_state: "Optional[NormalModel]" = None
+
+    def step(self, observation: "NDArray") -> "StreamStepDLM":
+
+        step = super().step(observation)
+        self.lagged_state = self.smooth_lagged()
+
+        return step
+
+    def lagged_time(self) -> "int":
+        return self.time - self.lag
+
+    def smooth_lagged(self) -> "Optional[NormalModel]":
+
+        if self.lagged_time() < 0:
+            return None
+
+        smoothed_state = self.filtered_state
+
+        for step in reversed(self.history):
+            joint_model = JointModel(smoothed_state, step.smoother, self.numerics)
+            smoothed_state = joint_model.mutate_normal()
+
+        return smoothed_state
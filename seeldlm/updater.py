@@ -1,54 +1,220 @@
+from typing import Any, Dict, Optional, Tuple
 from numpy.typing import NDArray
 import numpy
 
 from .objects import NormalModel, TransitionModel, JointModel, InvWishartModel
+from .objects.utils import check_numerics
+from .containers import LazyNormalContainer
 from .memory import MemoryDLM
+from .retention import RetentionDLM
+from .steady import SteadyStateDLM
+
+# -- Observation rows per state dimension beyond which information form pays off
+INFORMATION_RATIO = 4
 
 
 class UpdaterDLM(MemoryDLM):
-    def __init__(self, observed_period: "int", predicted_period: "int"):
-        super().__init__(observed_period, predicted_period)
+    def __init__(
+        self,
+        observed_period: "int",
+        predicted_period: "int",
+        storage: "str" = "dict",
+        numerics: "str" = "inverse",
+        steady_tolerance: "Optional[float]" = None,
+        lazy_spaces: "bool" = False,
+        retention: "Optional[RetentionDLM]" = None,
+        layout: "str" = "dense",
+        information: "Optional[bool]" = None,
+    ):
+        super().__init__(
+            observed_period, predicted_period, storage, lazy_spaces, retention, layout
+        )
+        self.numerics = check_numerics(numerics)
+        self.information = information
+        self.steady = SteadyStateDLM(steady_tolerance)
+        self.latest: "Dict[str, Tuple[int, Any]]" = dict()
 
-    def evolve(self, time: "int", evolver: "TransitionModel"):
+    def information_form(
+        self, state: "NormalModel", observer: "TransitionModel"
+    ) -> "bool":
+
+        if self.information is not None:
+            return self.information
+
+        M = observer.weights.shape[-2]
+        P = state.mean.shape[-2]
+
+        return observer.covariance.ndim == 2 and M >= INFORMATION_RATIO * P
+
+    def recall(self, name: "str", time: "int") -> "Any":
+
+        if name in self.latest and self.latest[name][0] == time:
+            return self.latest[name][1]
+
+        return getattr(self, name).get_from_time(time)
+
+    def retain(self, name: "str", time: "int", object: "Any"):
+
+        self.latest[name] = (time, object)
+
+        if not self.retention.history:
+            return
+
+        if isinstance(object, NormalModel) and not self.retention.covariances:
+            object = NormalModel.mean_only(object.mean)
+
+        getattr(self, name).set_at_time(time, object)
+
+    def flush(self):
 
-        filtered_state: "NormalModel" = self.filtered_states.get_from_time(time)
+        for name in ("filtered_states", "wisharts"):
+            if name in self.latest:
+                time, object = self.latest[name]
+                getattr(self, name).set_at_time(time, object)
+
+    def evolution_step(
+        self, filtered_state: "NormalModel", evolver: "TransitionModel"
+    ) -> "Tuple[NormalModel, TransitionModel]":
+
+        joint_model = JointModel(filtered_state, evolver, self.numerics)
+
+        steady = self.steady.evolved
+        if self.steady.forward_frozen() and steady is not None:
+            return joint_model.transition_transumer_steady(steady)
 
-        joint_model = JointModel(filtered_state, evolver)
         evolved_state, smoother = joint_model.transition_transumer()
+        self.steady.evolved = JointModel(evolved_state, smoother, self.numerics)
+
+        return evolved_state, smoother
+
+    def evolution_state_step(
+        self, filtered_state: "NormalModel", evolver: "TransitionModel"
+    ) -> "NormalModel":
+
+        joint_model = JointModel(filtered_state, evolver, self.numerics)
+
+        # -- Without smoothers only the evolved state itself is needed
+        steady = self.steady.evolved_state
+        if self.steady.forward_frozen() and steady is not None:
+            return joint_model.mutate_normal_steady(steady)
+
+        evolved_state = joint_model.mutate_normal()
+        self.steady.evolved_state = evolved_state
+
+        return evolved_state
+
+    def observation_step(
+        self, evolved_state: "NormalModel", observer: "TransitionModel"
+    ) -> "Tuple[NormalModel, TransitionModel]":
+
+        joint_model = JointModel(evolved_state, observer, self.numerics)
+
+        steady = self.steady.observed
+        if self.steady.forward_frozen() and steady is not None:
+            return joint_model.transition_transumer_steady(steady)
+
+        # -- The (M, M) space covariance is only formed when history keeps it
+        evolved_space, filterer = joint_model.transition_transumer(
+            self.information_form(evolved_state, observer),
+            self.retention.dense_history(),
+        )
+        self.steady.observed = JointModel(evolved_space, filterer, self.numerics)
+
+        return evolved_space, filterer
 
-        self.smoothers.set_at_time(time + 1, smoother)
-        self.evolved_states.set_at_time(time + 1, evolved_state)
+    def filter_step(
+        self,
+        evolved_space: "NormalModel",
+        filterer: "TransitionModel",
+        prior_error: "InvWishartModel",
+        observation: "NDArray",
+    ) -> "Tuple[NormalModel, InvWishartModel, NDArray]":
+
+        filtered_state = filterer.observe(observation)
+        error = evolved_space.update_wishart(prior_error, observation, self.numerics)
+        log_likelihood = evolved_space.predictive_log_density(prior_error, error)
+
+        return filtered_state, error, log_likelihood
+
+    def settle_step(self, time: "int", filtered_state: "NormalModel"):
+
+        if self.steady.forward_frozen():
+            return
+
+        previous = self.steady.previous_covariance
+        current = filtered_state.covariance
+        if previous is not None and self.steady.converged(previous, current):
+            self.steady.forward_time = time + 1
+
+        self.steady.previous_covariance = current
+
+    def evolve(self, time: "int", evolver: "TransitionModel"):
+
+        filtered_state: "NormalModel" = self.recall("filtered_states", time)
+
+        if self.retention.smoothers:
+            evolved_state, smoother = self.evolution_step(filtered_state, evolver)
+            self.smoothers.set_at_time(time + 1, smoother)
+        else:
+            evolved_state = self.evolution_state_step(filtered_state, evolver)
+
+        self.retain("evolved_states", time + 1, evolved_state)
 
     def observe_evolved(self, time: "int", observer: "TransitionModel"):
 
-        evolved_state: "NormalModel" = self.evolved_states.get_from_time(time + 1)
+        evolved_state: "NormalModel" = self.recall("evolved_states", time + 1)
 
-        joint_model = JointModel(evolved_state, observer)
-        evolved_space, filterer = joint_model.transition_transumer()
+        evolved_space, filterer = self.observation_step(evolved_state, observer)
 
-        self.filterers.set_at_time(time + 1, filterer)
-        self.evolved_spaces.set_at_time(time + 1, evolved_space)
+        self.retain("filterers", time + 1, filterer)
+        self.retain("evolved_spaces", time + 1, evolved_space)
 
     def filter(self, time: "int", observation: "NDArray"):
 
-        evolved_space: "NormalModel" = self.evolved_spaces.get_from_time(time + 1)
-        filterer: "TransitionModel" = self.filterers.get_from_time(time + 1)
-        error: "InvWishartModel" = self.wisharts.get_from_time(time)
+        evolved_space: "NormalModel" = self.recall("evolved_spaces", time + 1)
+        filterer: "TransitionModel" = self.recall("filterers", time + 1)
+        prior_error: "InvWishartModel" = self.recall("wisharts", time)
 
-        filtered_state = filterer.observe(observation)
-        error = evolved_space.update_wishart(error, observation)
+        filtered_state, error, log_likelihood = self.filter_step(
+            evolved_space, filterer, prior_error, observation
+        )
 
-        self.filtered_states.set_at_time(time + 1, filtered_state)
-        self.wisharts.set_at_time(time + 1, error)
+        self.retain("filtered_states", time + 1, filtered_state)
+        self.retain("wisharts", time + 1, error)
+        self.log_likelihoods.set_at_time(time + 1, log_likelihood)
 
     def observe_filtered(self, time: "int", observer: "TransitionModel"):
 
-        filtered_state: "NormalModel" = self.filtered_states.get_from_time(time + 1)
+        if not self.retention.spaces:
+            return
+
+        if isinstance(self.filtered_spaces, LazyNormalContainer):
+            self.filtered_spaces.observe(time + 1, observer)
+            return
 
-        joint_model = JointModel(filtered_state, observer)
-        filtered_space = joint_model.mutate_normal()
+        filtered_state: "NormalModel" = self.recall("filtered_states", time + 1)
 
-        self.filtered_spaces.set_at_time(time + 1, filtered_space)
+        joint_model = JointModel(filtered_state, observer, self.numerics)
+
+        steady = self.steady.filtered_space
+        if self.steady.forward_frozen() and steady is not None:
+            filtered_space = joint_model.mutate_normal_steady(steady)
+        else:
+            filtered_space = joint_model.mutate_normal()
+            self.steady.filtered_space = filtered_space
+
+        self.retain("filtered_spaces", time + 1, filtered_space)
+
+    def settle(self, time: "int"):
+
+        if self.steady.forward_frozen():
+            return
+
+        if self.steady.previous_covariance is None:
+            previous: "NormalModel" = self.recall("filtered_states", time)
+            self.steady.previous_covariance = previous.covariance
+
+        self.settle_step(time, self.recall("filtered_states", time + 1))
 
     def smoothen(self, time: "int"):
 
@@ -57,11 +223,30 @@ class UpdaterDLM(MemoryDLM):
             self.S - time
         )
 
-        joint_model = JointModel(smoothed_state, smoother)
-        smoothed_state = joint_model.mutate_normal()
+        joint_model = JointModel(smoothed_state, smoother, self.numerics)
+
+        steady = self.steady.smoothed_state
+        if self.steady.backward_frozen(self.S - time) and steady is not None:
+            smoothed_state = joint_model.mutate_normal_steady(steady)
+            self.steady.smoothed_frozen = True
+        else:
+            smoothed_state = joint_model.mutate_normal()
+            self.steady.smoothed_state = smoothed_state
+            self.steady.smoothed_frozen = False
 
         self.smoothed_states.set_at_time(self.S - time - 1, smoothed_state)
 
+    def settle_smoothed(self, time: "int"):
+
+        if self.steady.backward_settled or not self.steady.forward_frozen():
+            return
+
+        previous: "NormalModel" = self.smoothed_states.get_from_time(self.S - time)
+        current: "NormalModel" = self.smoothed_states.get_from_time(self.S - time - 1)
+
+        if self.steady.converged(previous.covariance, current.covariance):
+            self.steady.backward_settled = True
+
     def create_state_em(self, time: "int", evolver: "TransitionModel"):
 
         smoother: "TransitionModel" = self.smoothers.get_from_time(self.S - time)
@@ -69,7 +254,7 @@ class UpdaterDLM(MemoryDLM):
             self.S - time
         )
 
-        joint_model = JointModel(smoothed_state, smoother)
+        joint_model = JointModel(smoothed_state, smoother, self.numerics)
         pre_true_density = joint_model.generate_normal()
 
         transformer = numpy.block(
@@ -82,19 +267,29 @@ class UpdaterDLM(MemoryDLM):
         target_density = NormalModel(evolver.bias, evolver.covariance)
 
         em_estimate = target_density.derive_row_covariance_em_estimate(
-            true_density, true_wishart
+            true_density, true_wishart, self.numerics
         )
 
         self.state_em.set_at_time(self.S - time, em_estimate)
 
     def observe_smoothed(self, time: "int", observer: "TransitionModel"):
 
+        if isinstance(self.smoothed_spaces, LazyNormalContainer):
+            self.smoothed_spaces.observe(self.S - time, observer)
+            return
+
         smoothed_state: "NormalModel" = self.smoothed_states.get_from_time(
             self.S - time
         )
 
-        joint_model = JointModel(smoothed_state, observer)
-        smoothed_space = joint_model.mutate_normal()
+        joint_model = JointModel(smoothed_state, observer, self.numerics)
+
+        steady = self.steady.smoothed_space
+        if self.steady.smoothed_frozen and steady is not None:
+            smoothed_space = joint_model.mutate_normal_steady(steady)
+        else:
+            smoothed_space = joint_model.mutate_normal()
+            self.steady.smoothed_space = smoothed_space
 
         self.smoothed_spaces.set_at_time(self.S - time, smoothed_space)
 
@@ -104,18 +299,22 @@ class UpdaterDLM(MemoryDLM):
             self.S + time
         )
 
-        joint_model = JointModel(predicted_state, evolver)
+        joint_model = JointModel(predicted_state, evolver, self.numerics)
         predicted_state = joint_model.mutate_normal()
 
         self.predicted_states.set_at_time(self.S + time + 1, predicted_state)
 
     def observe_predicted(self, time: "int", observer: "TransitionModel"):
 
+        if isinstance(self.predicted_spaces, LazyNormalContainer):
+            self.predicted_spaces.observe(self.S + time + 1, observer)
+            return
+
         predicted_state: "NormalModel" = self.predicted_states.get_from_time(
             self.S + time + 1
         )
 
-        joint_model = JointModel(predicted_state, observer)
+        joint_model = JointModel(predicted_state, observer, self.numerics)
         predicted_space = joint_model.mutate_normal()
 
         self.predicted_spaces.set_at_time(self.S + time + 1, predicted_space)
@@ -1,7 +1,7 @@
 import numpy
-from seeldlm import NormalModel
+from seeldlm import NormalModel, InvWishartModel
 from numpy.typing import NDArray
-from typing import Tuple
+from typing import List, Tuple
 
 
 def rand_obs(shape: "Tuple[int, int]") -> "NormalModel":
@@ -33,3 +33,32 @@ def nan_detect(NDArray: "NDArray") -> "NDArray":
     nan_indices: "NDArray" = numpy.argwhere(~numpy.isnan(NDArray))[:, 0]
 
     return nan_indices
+
+
+def stack_normals(models: "List[NormalModel]") -> "NormalModel":
+
+    mean: "NDArray" = numpy.stack([model.mean for model in models])
+    covariance: "NDArray" = numpy.stack([model.covariance for model in models])
+
+    return NormalModel(mean, covariance)
+
+
+def stack_wisharts(models: "List[InvWishartModel]") -> "InvWishartModel":
+
+    shapes = set(model.shape for model in models)
+    if len(shapes) != 1:
+        raise BaseException(f"Batched wisharts need a common shape, got {shapes}")
+
+    scale: "NDArray" = numpy.stack([model.scale for model in models])
+
+    return InvWishartModel(scale, shapes.pop())
+
+
+def select_normal(model: "NormalModel", series: "int") -> "NormalModel":
+
+    return NormalModel(model.mean[series], model.covariance[series])
+
+
+def select_wishart(model: "InvWishartModel", series: "int") -> "InvWishartModel":
+
+    return InvWishartModel(model.scale[series], model.shape)
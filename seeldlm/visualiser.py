@@ -1,6 +1,9 @@
-import matplotlib.pyplot as plt
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+import os
+import pathlib
 import numpy
 from numpy.typing import NDArray
 from abc import ABC, abstractmethod
@@ -8,6 +11,75 @@ from abc import ABC, abstractmethod
 
 from .memory import PrimeMemoryDLM, MemoryDLM
 from .containers import NormalContainer, InvWishartContainer
+from .intervals import IntervalDLM
+
+# -- Layer name to (colour, legend label)
+LAYERS = {
+    "observations": ("blue", "Observations"),
+    "filtered": ("green", "Filtered Predictions"),
+    "smoothed": ("red", "Smoothed Predictions"),
+    "predicted": ("violet", "Further Predictions"),
+    "evolved": ("orange", "Evolved Predictions"),
+}
+
+Trace = Tuple[NDArray, NDArray, Optional[NDArray], Optional[NDArray]]
+
+
+def downsample_indices(values: "NDArray", points: "Optional[int]") -> "NDArray":
+
+    length = values.shape[0]
+    if points is None or length <= max(points, 4):
+        return numpy.arange(length)
+
+    # -- Min-max decimation: keep each bucket's extremes so peaks survive
+    buckets = max((points - 2) // 2, 1)
+    edges = numpy.linspace(1, length - 1, buckets + 1).astype(int)
+    bucket = numpy.searchsorted(edges, numpy.arange(1, length - 1), "right") - 1
+
+    filled = numpy.where(numpy.isnan(values[1:-1]), numpy.inf, values[1:-1])
+    order = numpy.lexsort((filled, bucket))
+    sorted_bucket = bucket[order]
+    firsts = numpy.flatnonzero(numpy.r_[True, numpy.diff(sorted_bucket) != 0])
+    lasts = numpy.r_[firsts[1:], order.shape[0]] - 1
+
+    filled = numpy.where(numpy.isnan(values[1:-1]), -numpy.inf, values[1:-1])
+    maximums = numpy.lexsort((filled, bucket))[lasts]
+
+    indices = numpy.concatenate(([0, length - 1], order[firsts] + 1, maximums + 1))
+    return numpy.unique(indices)
+
+
+def downsample_trace(
+    domain: "NDArray",
+    values: "NDArray",
+    errors: "NDArray",
+    points: "Optional[int]",
+) -> "Tuple[NDArray, NDArray, NDArray]":
+
+    indices = downsample_indices(values, points)
+    return domain[indices], values[indices], errors[indices]
+
+
+def render_panel(path: "str", title: "str", traces: "Dict[str, Trace]", width: "int"):
+
+    # -- Bare figures are not tracked by pyplot, so they are freed after saving
+    figure = Figure(figsize=(width, 4.8))
+    axes = figure.add_subplot()
+
+    for name, (domain, values, lower, upper) in traces.items():
+        colour, label = LAYERS[name]
+        if lower is not None and upper is not None:
+            axes.fill_between(domain, lower, upper, alpha=0.35, color=colour)
+        axes.plot(domain, values, label=f"{label} {title}", color=colour)
+
+    axes.legend()
+    figure.savefig(path)
+
+    return path
+
+
+def render_task(task: "Tuple[str, str, Dict[str, Trace], int]") -> "str":
+    return render_panel(*task)
 
 
 class VisualStategy(ABC):
@@ -126,11 +198,25 @@ class DataVisual(VisualStategy):
 
 
 class VisualDLM:
-    def __init__(self, memory: "MemoryDLM", prime_memory: "PrimeMemoryDLM"):
+    def __init__(
+        self,
+        memory: "MemoryDLM",
+        prime_memory: "PrimeMemoryDLM",
+        headless: "bool" = False,
+        points: "Optional[int]" = None,
+    ):
         self.memory = memory
         self.prime_memory = prime_memory
+        self.headless = headless
+        self.points = points
 
-        figure, axes = plt.subplots()
+        if headless:
+            figure = Figure()
+            axes = figure.add_subplot()
+        else:
+            import matplotlib.pyplot as plt
+
+            figure, axes = plt.subplots()
         figure.set_figwidth(20)
         self.figure: "Figure" = figure
         self.axes: "Axes" = axes
@@ -151,6 +237,7 @@ class VisualDLM:
         domain = generator.create_domain()
         values = generator.create_values(feature, subject)
         errors = generator.create_error(feature, subject, significance_level)
+        domain, values, errors = downsample_trace(domain, values, errors, self.points)
 
         self.axes.fill_between(
             domain, values - errors, values + errors, alpha=0.35, color=COLOUR
@@ -176,6 +263,8 @@ class VisualDLM:
 
         domain = generator.create_domain()
         values = generator.create_values(feature, subject)
+        indices = downsample_indices(values, self.points)
+        domain, values = domain[indices], values[indices]
 
         self.axes.plot(
             domain,
@@ -201,6 +290,7 @@ class VisualDLM:
         domain = generator.create_domain()
         values = generator.create_values(feature, subject)
         errors = generator.create_error(feature, subject, significance_level)
+        domain, values, errors = downsample_trace(domain, values, errors, self.points)
 
         self.axes.fill_between(
             domain, values - errors, values + errors, alpha=0.35, color=COLOUR
@@ -229,6 +319,7 @@ class VisualDLM:
         domain = generator.create_domain()
         values = generator.create_values(feature, subject)
         errors = generator.create_error(feature, subject, significance_level)
+        domain, values, errors = downsample_trace(domain, values, errors, self.points)
 
         self.axes.fill_between(
             domain, values - errors, values + errors, alpha=0.35, color=COLOUR
@@ -257,6 +348,7 @@ class VisualDLM:
         domain = generator.create_domain()
         values = generator.create_values(feature, subject)
         errors = generator.create_error(feature, subject, significance_level)
+        domain, values, errors = downsample_trace(domain, values, errors, self.points)
 
         self.axes.fill_between(
             domain, values - errors, values + errors, alpha=0.35, color=COLOUR
@@ -268,10 +360,127 @@ class VisualDLM:
             color=COLOUR,
         )
 
-    def show_image(self, save_image: "bool" = False):
+    def show_image(self, save_image: "bool" = False, path: "str" = "saved-dlm-image"):
         self.axes.legend()
 
-        if save_image:
-            self.figure.savefig("saved-dlm-image")
+        if save_image or self.headless:
+            self.figure.savefig(path)
+
+        if not self.headless:
+            self.figure.show(warn=False)
 
-        self.figure.show(warn=False)
+
+class ExportDLM:
+    def __init__(
+        self,
+        memory: "MemoryDLM",
+        prime_memory: "PrimeMemoryDLM",
+        layers: "Sequence[str]" = ("observations", "filtered", "predicted"),
+        significance_level: "float" = 0.05,
+        points: "Optional[int]" = 2000,
+        batch: "Sequence[int]" = (),
+    ):
+
+        for layer in layers:
+            if not layer in LAYERS:
+                raise BaseException(f"Unknown layer {layer}")
+
+        # -- Batched memories plot one batch element at a time
+        batch_axes = prime_memory.observations.ndim - 3
+        if len(batch) != batch_axes:
+            raise BaseException(
+                f"Memory has {batch_axes} batch axes, got batch index {tuple(batch)}"
+            )
+
+        self.memory = memory
+        self.prime_memory = prime_memory
+        self.layers = tuple(layers)
+        self.significance_level = significance_level
+        self.points = points
+        self.batch = tuple(batch)
+        self.intervals = IntervalDLM(memory)
+        self.bounds: "Dict[str, Tuple[NDArray, NDArray]]" = dict()
+
+    def layer_bounds(self, layer: "str") -> "Tuple[NDArray, NDArray]":
+
+        # -- One vectorised interval call per layer serves every panel
+        if not layer in self.bounds:
+            interval = getattr(self.intervals, layer)
+            self.bounds[layer] = interval(self.significance_level)
+
+        return self.bounds[layer]
+
+    def layer_domain(self, layer: "str") -> "NDArray":
+        S, P = self.prime_memory.S, self.prime_memory.P
+        if layer == "observations":
+            return numpy.arange(1, S + P + 1, 1)
+        if layer == "predicted":
+            return numpy.arange(S, S + P + 1, 1)
+        return numpy.arange(1, S + 1, 1)
+
+    def panel(self, feature: "int", subject: "int") -> "Dict[str, Trace]":
+
+        S, P = self.prime_memory.S, self.prime_memory.P
+        traces: "Dict[str, Trace]" = dict()
+
+        for layer in self.layers:
+            domain = self.layer_domain(layer)
+
+            if layer == "observations":
+                observations = self.prime_memory.observations
+                values = numpy.asarray(
+                    observations[self.batch + (feature, subject)][0 : S + P]
+                )
+                indices = downsample_indices(values, self.points)
+                domain, values = domain[indices], values[indices]
+                traces[layer] = (domain, values, None, None)
+                continue
+
+            # -- Bounds run over time first, then any batch axes
+            index = (slice(None),) + self.batch + (feature, subject)
+            lower, upper = self.layer_bounds(layer)
+            lower, upper = lower[index], upper[index]
+            values = (lower + upper) / 2
+            indices = downsample_indices(values, self.points)
+            traces[layer] = (
+                domain[indices],
+                values[indices],
+                lower[indices],
+                upper[indices],
+            )
+
+        return traces
+
+    def export(
+        self,
+        panels: "Sequence[Tuple[int, int]]",
+        directory: "str",
+        processes: "Optional[int]" = None,
+        extension: "str" = "png",
+        width: "int" = 20,
+    ) -> "List[str]":
+
+        target = pathlib.Path(directory)
+        target.mkdir(parents=True, exist_ok=True)
+
+        prefix = "".join(f"{index}-" for index in self.batch)
+
+        # -- Workers receive downsampled traces only, never the model memory
+        tasks = [
+            (
+                str(target / f"dlm-{prefix}{feature}-{subject}.{extension}"),
+                f"({feature}, {subject})",
+                self.panel(feature, subject),
+                width,
+            )
+            for feature, subject in panels
+        ]
+
+        if processes == 1 or len(tasks) <= 1:
+            return [render_task(task) for task in tasks]
+
+        workers = processes if processes is not None else os.cpu_count() or 1
+        chunksize = max(1, len(tasks) // (4 * workers))
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(render_task, tasks, chunksize=chunksize))
@@ -0,0 +1,53 @@
+import numpy
+
+import seeldlm
+
+
+def build_prime_memory(
+    seed: "int" = 0,
+    observed_period: "int" = 60,
+    predicted_period: "int" = 10,
+    subjects: "int" = 2,
+    features: "int" = 1,
+) -> "seeldlm.PrimeMemoryDLM":
+
+    rng = numpy.random.default_rng(seed)
+    shape = (features, subjects, observed_period + predicted_period)
+    observations = numpy.cumsum(rng.normal(0, 3, size=shape), axis=2)
+
+    factory = seeldlm.ComponentFactory()
+    compiler = seeldlm.ModelCompiler(features)
+    compiler.add_component_sequence(factory.polynomial(2), factory.harmonics(6, 2))
+    compiler.set_vertex(-1, 0, [0])
+    compiler.set_vertex(-1, 1, [0])
+
+    transition = compiler.compile_transition()
+    observation = compiler.compile_observation()
+    P = transition.shape[0]
+
+    root = rng.random((P, P + 2))
+    primordial_model = seeldlm.NormalModel(rng.random((P, subjects)), root @ root.T)
+    root = rng.random((subjects, subjects + 2))
+    primordial_error = seeldlm.InvWishartModel(root @ root.T, subjects)
+
+    evolvers = seeldlm.TransitionContainer(0, 1)
+    evolvers.set_at_time(
+        0, seeldlm.TransitionModel(numpy.zeros((P, subjects)), transition, numpy.eye(P))
+    )
+    observers = seeldlm.TransitionContainer(0, 1)
+    observers.set_at_time(
+        0,
+        seeldlm.TransitionModel(
+            numpy.zeros((features, subjects)), observation, numpy.eye(features) * 50
+        ),
+    )
+
+    return seeldlm.PrimeMemoryDLM(
+        observed_period=observed_period,
+        predicted_period=predicted_period,
+        primordial_model=primordial_model,
+        primordial_error=primordial_error,
+        evolvers=evolvers,
+        observers=observers,
+        observations=observations,
+    )
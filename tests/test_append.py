@@ -0,0 +1,128 @@
+import numpy
+import pytest
+
+import seeldlm
+from tests.helpers import build_prime_memory
+
+
+def split_modeller(storage, steady_tolerance, first=40, total=60, lazy_spaces=False):
+
+    prime_memory = build_prime_memory(observed_period=total)
+    observations = prime_memory.observations
+    prime_memory.S = first
+    prime_memory.observations = observations[..., :first]
+
+    modeller = seeldlm.ModellerDLM(
+        prime_memory,
+        storage=storage,
+        steady_tolerance=steady_tolerance,
+        lazy_spaces=lazy_spaces,
+    )
+    modeller.forward()
+    modeller.backward()
+
+    return modeller, observations
+
+
+@pytest.mark.parametrize("storage", ["dict", "tensor"])
+@pytest.mark.parametrize("steady_tolerance", [None, 1e-9])
+def test_append_matches_full_run(storage, steady_tolerance):
+
+    reference = seeldlm.ModellerDLM(
+        build_prime_memory(observed_period=60),
+        storage=storage,
+        steady_tolerance=steady_tolerance,
+    )
+    reference.forward()
+    reference.backward()
+    reference.beyond()
+
+    modeller, observations = split_modeller(storage, steady_tolerance)
+    modeller.append(observations[..., 40:50])
+    modeller.append(observations[..., 50:60])
+    modeller.backward()
+
+    memory, expected = modeller.get_memory(), reference.get_memory()
+    assert numpy.allclose(
+        memory.filtered_spaces.means(1, 61), expected.filtered_spaces.means(1, 61)
+    )
+    assert numpy.allclose(
+        memory.smoothed_states.means(0, 61), expected.smoothed_states.means(0, 61)
+    )
+    assert numpy.allclose(
+        memory.predicted_spaces.covariances(60, 71),
+        expected.predicted_spaces.covariances(60, 71),
+    )
+    assert numpy.allclose(modeller.log_likelihood(), reference.log_likelihood())
+
+
+@pytest.mark.parametrize("storage", ["dict", "tensor"])
+def test_append_keeps_approximate_smoothing(storage):
+
+    modeller, observations = split_modeller(storage, None)
+    smoothed = modeller.get_memory().smoothed_states.means(0, 41)
+
+    modeller.append(observations[..., 40:60])
+    memory = modeller.get_memory()
+
+    assert memory.smoothed_from == 61
+    assert numpy.allclose(memory.smoothed_states.means(0, 41), smoothed)
+    assert not memory.smoothed_states.contains(50)
+
+    # -- A window that leaves appended times unsmoothed cannot be joined
+    with pytest.raises(BaseException, match="stale"):
+        modeller.backward(window=10)
+
+
+@pytest.mark.parametrize("storage", ["dict", "tensor"])
+@pytest.mark.parametrize("lazy_spaces", [False, True])
+def test_window_after_append_matches_full_backward(storage, lazy_spaces):
+
+    reference = seeldlm.ModellerDLM(
+        build_prime_memory(observed_period=60), storage=storage
+    )
+    reference.forward()
+    reference.backward()
+    expected = reference.get_memory()
+
+    modeller, observations = split_modeller(storage, None, lazy_spaces=lazy_spaces)
+    approximate = modeller.get_memory().smoothed_states.means(0, 35)
+
+    modeller.append(observations[..., 40:60])
+    modeller.backward(window=25)
+    memory = modeller.get_memory()
+
+    assert memory.smoothed_from == 35
+    assert numpy.allclose(
+        memory.smoothed_states.means(35, 61), expected.smoothed_states.means(35, 61)
+    )
+    assert numpy.allclose(
+        memory.smoothed_states.covariances(35, 61),
+        expected.smoothed_states.covariances(35, 61),
+    )
+    assert numpy.allclose(
+        memory.smoothed_spaces.means(35, 61), expected.smoothed_spaces.means(35, 61)
+    )
+
+    # -- Entries before the window are the earlier, shorter-history smoothing
+    assert numpy.allclose(memory.smoothed_states.means(0, 35), approximate)
+    assert not numpy.allclose(
+        memory.smoothed_states.means(0, 35), expected.smoothed_states.means(0, 35)
+    )
+
+    modeller.backward()
+    assert memory.smoothed_from == 0
+    assert numpy.allclose(
+        memory.smoothed_states.means(0, 61), expected.smoothed_states.means(0, 61)
+    )
+
+
+@pytest.mark.parametrize("storage", ["dict", "tensor"])
+def test_refiltering_voids_windowed_backward(storage):
+
+    modeller, _ = split_modeller(storage, None)
+    modeller.backward(window=10)
+
+    modeller.forward()
+    with pytest.raises(BaseException, match="stale"):
+        modeller.backward(window=10)
@@ -0,0 +1,79 @@
+import math
+
+import numpy
+import pytest
+from scipy import integrate, stats
+
+import seeldlm
+from seeldlm.backtest import BacktestDLM, student_t_crps
+from tests.helpers import build_prime_memory
+
+
+@pytest.mark.parametrize("shape", [3.0, 12.0])
+def test_crps_matches_numerical_integral(shape):
+
+    observation, location, scale = 1.3, 0.4, 2.0
+    distribution = stats.t(shape, loc=location, scale=scale)
+
+    # -- CRPS is the integral of (F(x) - 1{x >= y})^2 over x
+    below = integrate.quad(lambda x: distribution.cdf(x) ** 2, -numpy.inf, observation)
+    above = integrate.quad(lambda x: distribution.sf(x) ** 2, observation, numpy.inf)
+
+    crps = student_t_crps(numpy.asarray(observation), location, scale, shape)
+    assert numpy.isclose(crps, below[0] + above[0])
+
+
+def test_crps_tends_to_normal_closed_form():
+
+    crps = student_t_crps(numpy.asarray(0.0), 0.0, 1.0, 1e6)
+    assert numpy.isclose(crps, 2 * stats.norm.pdf(0) - 1 / math.sqrt(math.pi))
+
+
+def test_accumulate_known_metrics():
+
+    modeller = seeldlm.ModellerDLM(build_prime_memory(subjects=3))
+    backtest = BacktestDLM(modeller, horizon=1)
+    backtest.origins = 1
+
+    mean = numpy.zeros((1, 3))
+    scale = numpy.ones((1, 3))
+    observation = numpy.array([[1.0, -3.0, numpy.nan]])
+    backtest.accumulate(0, observation, mean, scale, 1e6)
+
+    metrics = backtest.metrics()
+    assert numpy.array_equal(metrics["counts"][0], [[1, 1, 0]])
+    assert numpy.allclose(metrics["mae"][0, :, :2], [[1.0, 3.0]])
+    assert numpy.isnan(metrics["mae"][0, 0, 2])
+
+    # -- A 95% interval of a standard normal covers 1 but not -3
+    assert numpy.allclose(metrics["coverage"][0, :, :2], [[1.0, 0.0]])
+
+    expected = [stats.norm.expect(lambda x: abs(x - y)) for y in (1.0, -3.0)]
+    expected = [value - 1 / math.sqrt(math.pi) for value in expected]
+    assert numpy.allclose(metrics["crps"][0, :, :2], [expected], atol=1e-5)
+
+
+def test_one_step_mae_matches_evolved_spaces():
+
+    modeller = seeldlm.ModellerDLM(build_prime_memory())
+    metrics = BacktestDLM(modeller, horizon=3, every=5).run()
+
+    memory = modeller.get_memory()
+    observations = modeller.get_prime_memory().observations
+    origins = range(5, modeller.get_prime_memory().S, 5)
+
+    errors = [
+        numpy.abs(
+            observations[..., time] - memory.evolved_spaces.get_from_time(time + 1).mean
+        )
+        for time in origins
+    ]
+    assert numpy.allclose(metrics["mae"][0], numpy.mean(errors, axis=0))
+    assert numpy.array_equal(metrics["counts"][0], numpy.full((1, 2), len(origins)))
+
+
+def test_metrics_need_an_origin():
+
+    modeller = seeldlm.ModellerDLM(build_prime_memory())
+    with pytest.raises(BaseException, match="No forecast origin"):
+        BacktestDLM(modeller, horizon=1).metrics()
@@ -0,0 +1,69 @@
+import numpy
+import pytest
+
+import seeldlm
+from seeldlm.utils import stack_normals, stack_wisharts
+from tests.helpers import build_prime_memory
+
+
+def batched_prime_memory(prime_memories):
+
+    first = prime_memories[0]
+
+    return seeldlm.PrimeMemoryDLM(
+        first.S,
+        first.P,
+        numpy.stack([prime_memory.observations for prime_memory in prime_memories]),
+        stack_normals(
+            [prime_memory.primordial_model for prime_memory in prime_memories]
+        ),
+        stack_wisharts(
+            [prime_memory.primordial_error for prime_memory in prime_memories]
+        ),
+        first.evolvers,
+        first.observers,
+    )
+
+
+@pytest.mark.parametrize(
+    "storage, numerics", [("dict", "inverse"), ("tensor", "cholesky")]
+)
+def test_batched_matches_per_series(storage, numerics):
+
+    prime_memories = [build_prime_memory(seed=seed) for seed in range(3)]
+
+    singles = []
+    for prime_memory in prime_memories:
+        modeller = seeldlm.ModellerDLM(prime_memory, storage, numerics)
+        modeller.forward()
+        modeller.backward()
+        modeller.beyond()
+        singles.append(modeller)
+
+    batched = seeldlm.ModellerDLM(
+        batched_prime_memory(prime_memories), storage, numerics
+    )
+    batched.forward()
+    batched.backward()
+    batched.beyond()
+
+    S, P = batched.prime_memory.S, batched.prime_memory.P
+    memory = batched.get_memory()
+
+    assert numpy.allclose(
+        batched.log_likelihood(), [single.log_likelihood() for single in singles]
+    )
+    for index, single in enumerate(singles):
+        for name in ("filtered_spaces", "smoothed_spaces"):
+            assert numpy.allclose(
+                getattr(memory, name).means(1, S + 1)[:, index],
+                getattr(single.get_memory(), name).means(1, S + 1),
+            )
+        assert numpy.allclose(
+            memory.predicted_spaces.covariances(S, S + P + 1)[:, index],
+            single.get_memory().predicted_spaces.covariances(S, S + P + 1),
+        )
+        assert numpy.allclose(
+            memory.wisharts.scales(0, S + 1)[:, index],
+            single.get_memory().wisharts.scales(0, S + 1),
+        )
@@ -0,0 +1,125 @@
+import os
+import pathlib
+
+import numpy
+import pytest
+
+import seeldlm
+from tests.helpers import build_prime_memory
+
+
+class Interrupt(Exception):
+    pass
+
+
+def interrupted_run(directory, storage, stop=35, every=10):
+
+    def callback(time):
+        if time == stop:
+            raise Interrupt()
+
+    modeller = seeldlm.ModellerDLM(build_prime_memory(), storage=storage)
+    with pytest.raises(Interrupt):
+        modeller.forward(
+            checkpoint_directory=directory, checkpoint_every=every, callback=callback
+        )
+
+
+@pytest.mark.parametrize("storage", ["dict", "tensor"])
+def test_resume_matches_full_run(tmp_path, storage):
+
+    reference = seeldlm.ModellerDLM(build_prime_memory(), storage=storage)
+    reference.forward()
+
+    interrupted_run(str(tmp_path), storage)
+
+    restored = seeldlm.ModellerDLM.restore(str(tmp_path), storage=storage)
+    assert restored.filtered_time() == 30
+
+    restored.forward(start=restored.filtered_time())
+
+    S = reference.prime_memory.S
+    assert numpy.allclose(restored.log_likelihoods(), reference.log_likelihoods())
+    assert numpy.allclose(
+        restored.memory.filtered_states.means(0, S + 1),
+        reference.memory.filtered_states.means(0, S + 1),
+    )
+
+
+def test_checkpoints_within_a_pass_are_incremental(tmp_path):
+
+    inodes = []
+
+    def callback(time):
+        memory = tmp_path / "memory"
+        if memory.exists():
+            inodes.append((memory.stat().st_ino, (tmp_path / "prime").stat().st_ino))
+
+    modeller = seeldlm.ModellerDLM(build_prime_memory(), storage="tensor")
+    modeller.forward(
+        checkpoint_directory=str(tmp_path), checkpoint_every=10, callback=callback
+    )
+
+    # -- Only the first save of the pass rewrites the directories
+    assert len(set(inodes)) == 1
+
+    restored = seeldlm.ModellerDLM.restore(str(tmp_path))
+    assert numpy.allclose(restored.log_likelihoods(), modeller.log_likelihoods())
+
+
+def test_restore_falls_back_to_previous_checkpoint(tmp_path):
+
+    interrupted_run(str(tmp_path), "tensor")
+
+    for name in ("prime", "memory"):
+        os.replace(tmp_path / name, tmp_path / f"{name}.old")
+
+    restored = seeldlm.ModellerDLM.restore(str(tmp_path))
+    assert restored.filtered_time() == 30
+
+    restored.checkpoint(str(tmp_path))
+    assert sorted(path.name for path in pathlib.Path(tmp_path).iterdir()) == [
+        "memory",
+        "prime",
+    ]
+
+
+def test_restore_keeps_saved_config(tmp_path):
+
+    retention = seeldlm.RetentionDLM.forward_only()
+    modeller = seeldlm.ModellerDLM(
+        build_prime_memory(),
+        storage="tensor",
+        retention=retention,
+        information=True,
+        steady_tolerance=1e-9,
+    )
+    modeller.forward()
+    modeller.checkpoint(str(tmp_path))
+
+    restored = seeldlm.ModellerDLM.restore(str(tmp_path))
+    assert restored.config() == modeller.config()
+
+    restored = seeldlm.ModellerDLM.restore(str(tmp_path), information=False)
+    assert restored.memory.information is False
+
+
+@pytest.mark.parametrize("storage", ["dict", "tensor"])
+def test_lazy_spaces_checkpoint_unevaluated(tmp_path, storage):
+
+    modeller = seeldlm.ModellerDLM(
+        build_prime_memory(), storage=storage, lazy_spaces=True
+    )
+    modeller.forward()
+    modeller.checkpoint(str(tmp_path))
+
+    # -- Saving must not force the lazy observation spaces
+    assert len(modeller.memory.filtered_spaces.cache) == 0
+
+    S = modeller.prime_memory.S
+    restored = seeldlm.ModellerDLM.restore(str(tmp_path), storage=storage)
+    assert restored.memory.lazy_spaces
+    assert numpy.allclose(
+        restored.memory.filtered_spaces.means(1, S + 1),
+        modeller.memory.filtered_spaces.means(1, S + 1),
+    )
@@ -0,0 +1,63 @@
+import os
+
+import numpy
+import pytest
+
+import dataload
+
+HEADER = "group,,\nDate,Temperature,Humidity\n"
+
+
+def write_csv(path, rows):
+    with open(path, "w") as file:
+        file.write(HEADER)
+        for row in rows:
+            file.write(",".join(str(value) for value in row) + "\n")
+
+
+def test_weather_array_reads_requested_columns(tmp_path):
+
+    path = str(tmp_path / "weather.csv")
+    write_csv(path, [("a", 1.5, 10), ("b", 2.5, 20), ("c", 3.5, 30)])
+
+    array = dataload.weather_array(["Humidity", "Temperature"], path, chunksize=2)
+
+    assert array.shape == (2, 1, 3)
+    assert numpy.array_equal(array[:, 0], [[10, 20, 30], [1.5, 2.5, 3.5]])
+
+
+def test_weather_array_cache_follows_source(tmp_path, monkeypatch):
+
+    path = str(tmp_path / "weather.csv")
+    write_csv(path, [("a", 1.5, 10), ("b", 2.5, 20)])
+    first = dataload.weather_array(["Temperature"], path)
+    assert numpy.array_equal(first[0, 0], [1.5, 2.5])
+
+    # -- An unchanged source is served from the cache without parsing
+    with monkeypatch.context() as patch:
+        patch.setattr(dataload, "weather_columns", None)
+        cached = dataload.weather_array(["Temperature"], path)
+    assert numpy.array_equal(cached, first)
+
+    write_csv(path, [("a", 1.5, 10), ("b", 2.5, 20), ("c", 4.5, 40)])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    refreshed = dataload.weather_array(["Temperature"], path)
+    assert numpy.array_equal(refreshed[0, 0], [1.5, 2.5, 4.5])
+
+    # -- Same-size edits are caught through the modification time
+    write_csv(path, [("a", 1.5, 10), ("b", 2.5, 20), ("c", 7.5, 40)])
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2))
+
+    edited = dataload.weather_array(["Temperature"], path)
+    assert numpy.array_equal(edited[0, 0], [1.5, 2.5, 7.5])
+
+
+def test_weather_array_rejects_unknown_columns(tmp_path):
+
+    path = str(tmp_path / "weather.csv")
+    write_csv(path, [("a", 1.5, 10)])
+
+    with pytest.raises(BaseException, match="not found"):
+        dataload.weather_array(["Pressure"], path)
@@ -0,0 +1,89 @@
+import pathlib
+
+import numpy
+import pytest
+
+import seeldlm
+from seeldlm.visualiser import downsample_indices
+from tests.helpers import build_prime_memory
+from tests.test_batch import batched_prime_memory
+
+
+def test_min_max_downsampling_keeps_peaks():
+
+    rng = numpy.random.default_rng(0)
+    values = numpy.cumsum(rng.normal(size=100_000))
+    values[31_337] = values.max() + 50
+    values[77_777] = values.min() - 50
+    values[5_000] = numpy.nan
+
+    indices = downsample_indices(values, 2000)
+
+    assert len(indices) <= 2000
+    assert (numpy.diff(indices) > 0).all()
+    assert {0, 31_337, 77_777, 99_999} <= set(indices.tolist())
+
+    # -- Every bucket keeps its own extremes, not only the global ones
+    kept = values[indices]
+    for start in range(0, 100_000, 10_000):
+        window = values[start : start + 10_000]
+        assert numpy.nanmax(window) in kept
+        assert numpy.nanmin(window) in kept
+
+
+def test_short_traces_are_not_downsampled():
+
+    values = numpy.arange(50.0)
+    assert numpy.array_equal(downsample_indices(values, 2000), numpy.arange(50))
+    assert numpy.array_equal(downsample_indices(values, None), numpy.arange(50))
+
+
+def test_panel_downsamples_observations(tmp_path):
+
+    prime_memory = build_prime_memory(observed_period=3000, predicted_period=10)
+    observations = prime_memory.observations
+    observations[0, 1, 1234] = observations.max() + 100
+
+    modeller = seeldlm.ModellerDLM(prime_memory)
+    modeller.forward()
+    modeller.beyond()
+
+    export = seeldlm.ExportDLM(modeller.get_memory(), prime_memory, points=200)
+    traces = export.panel(0, 1)
+
+    domain, values, _, _ = traces["observations"]
+    assert len(values) <= 200
+    assert values.max() == observations[0, 1].max()
+    assert 1235 in domain.tolist()
+
+    domain, values, lower, upper = traces["filtered"]
+    assert len(values) <= 200
+    assert (lower <= upper).all()
+
+    paths = export.export([(0, 0), (0, 1)], str(tmp_path), processes=1)
+    assert all(pathlib.Path(path).stat().st_size > 0 for path in paths)
+
+
+def test_batched_panel_matches_single_series():
+
+    prime_memories = [build_prime_memory(seed=seed) for seed in range(3)]
+    single = seeldlm.ModellerDLM(prime_memories[1])
+    single.forward()
+    single.beyond()
+
+    batched_memory = batched_prime_memory(prime_memories)
+    batched = seeldlm.ModellerDLM(batched_memory)
+    batched.forward()
+    batched.beyond()
+
+    with pytest.raises(BaseException, match="batch axes"):
+        seeldlm.ExportDLM(batched.get_memory(), batched_memory)
+
+    export = seeldlm.ExportDLM(batched.get_memory(), batched_memory, batch=(1,))
+    expected = seeldlm.ExportDLM(single.get_memory(), prime_memories[1]).panel(0, 1)
+
+    for layer, traces in export.panel(0, 1).items():
+        for trace, reference in zip(traces, expected[layer]):
+            assert (
+                trace is None and reference is None or numpy.allclose(trace, reference)
+            )
@@ -0,0 +1,44 @@
+import numpy
+import pytest
+
+import seeldlm
+from tests.helpers import build_prime_memory
+
+
+def test_log_likelihood_is_monotone():
+
+    fitter = seeldlm.FitterDLM(build_prime_memory())
+    fitter.fit(max_iterations=8)
+
+    increments = numpy.diff(fitter.log_likelihoods)
+    assert len(increments) > 0
+    assert (increments >= -1e-6 * numpy.abs(fitter.log_likelihoods[1:])).all()
+
+
+def test_fit_returns_modeller_filtered_under_final_parameters():
+
+    fitter = seeldlm.FitterDLM(build_prime_memory())
+    modeller = fitter.fit(max_iterations=3)
+
+    refit = seeldlm.ModellerDLM(fitter.get_prime_memory(), storage="tensor")
+    refit.forward()
+
+    assert numpy.isclose(modeller.log_likelihood(), fitter.log_likelihoods[-1])
+    assert numpy.isclose(refit.log_likelihood(), fitter.log_likelihoods[-1])
+
+
+@pytest.mark.parametrize("max_iterations", [1, 4])
+def test_cholesky_matches_inverse(max_iterations):
+
+    fitters = [
+        seeldlm.FitterDLM(build_prime_memory(), numerics=numerics)
+        for numerics in ("inverse", "cholesky")
+    ]
+    for fitter in fitters:
+        fitter.fit(max_iterations=max_iterations)
+
+    assert numpy.allclose(fitters[0].log_likelihoods, fitters[1].log_likelihoods)
+    assert numpy.allclose(
+        fitters[0].get_prime_memory().evolvers.get_from_time(0).covariance,
+        fitters[1].get_prime_memory().evolvers.get_from_time(0).covariance,
+    )
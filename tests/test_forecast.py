@@ -0,0 +1,42 @@
+import numpy
+import pytest
+
+import seeldlm
+from tests.helpers import build_prime_memory
+
+HORIZONS = [1, 2, 3, 4, 7, 8, 10]
+
+
+@pytest.mark.parametrize("numerics", ["inverse", "cholesky"])
+def test_direct_forecast_matches_beyond(numerics):
+
+    modeller = seeldlm.ModellerDLM(build_prime_memory(), numerics=numerics)
+    modeller.forward()
+    modeller.beyond()
+    memory = modeller.get_memory()
+    S = memory.S
+
+    spaces = modeller.forecast(HORIZONS)
+    states = modeller.forecaster().states(HORIZONS)
+
+    for index, horizon in enumerate(HORIZONS):
+        state = memory.predicted_states.get_from_time(S + horizon)
+        space = memory.predicted_spaces.get_from_time(S + horizon)
+        assert numpy.allclose(states.mean[index], state.mean)
+        assert numpy.allclose(states.covariance[index], state.covariance)
+        assert numpy.allclose(spaces.mean[index], space.mean)
+        assert numpy.allclose(spaces.covariance[index], space.covariance)
+
+
+def test_horizons_stay_cached_until_forward():
+
+    modeller = seeldlm.ModellerDLM(build_prime_memory())
+    modeller.forward()
+
+    forecaster = modeller.forecaster()
+    forecaster.spaces([10, 3])
+    assert modeller.forecaster() is forecaster
+    assert {0, 3, 10} <= set(forecaster.propagators)
+
+    modeller.forward()
+    assert modeller.forecaster() is not forecaster
@@ -0,0 +1,74 @@
+import numpy
+import pytest
+
+import seeldlm
+from tests.helpers import build_prime_memory
+
+
+@pytest.mark.parametrize("features", [1, 30])
+@pytest.mark.parametrize("numerics", ["inverse", "cholesky"])
+def test_information_form_matches_dense_filter(features, numerics):
+
+    modellers = dict()
+    for information in (False, True):
+        modeller = seeldlm.ModellerDLM(
+            build_prime_memory(features=features),
+            numerics=numerics,
+            information=information,
+        )
+        modeller.forward()
+        modeller.backward()
+        modellers[information] = modeller
+
+    memory, expected = modellers[True].memory, modellers[False].memory
+    S = memory.S
+
+    assert numpy.allclose(
+        modellers[True].log_likelihoods(), modellers[False].log_likelihoods()
+    )
+    for name in ("filtered_states", "smoothed_states"):
+        assert numpy.allclose(
+            getattr(memory, name).means(0, S + 1),
+            getattr(expected, name).means(0, S + 1),
+        )
+        assert numpy.allclose(
+            getattr(memory, name).covariances(0, S + 1),
+            getattr(expected, name).covariances(0, S + 1),
+        )
+    assert numpy.allclose(
+        memory.wisharts.scales(0, S + 1), expected.wisharts.scales(0, S + 1)
+    )
+
+
+def test_wide_observations_pick_information_form():
+
+    modeller = seeldlm.ModellerDLM(build_prime_memory(features=30))
+    state = modeller.prime_memory.primordial_model
+    observer = modeller.prime_memory.observers.get_from_time(0)
+    assert modeller.memory.information_form(state, observer)
+
+    modeller = seeldlm.ModellerDLM(build_prime_memory(features=1))
+    observer = modeller.prime_memory.observers.get_from_time(0)
+    assert not modeller.memory.information_form(state, observer)
+
+
+def test_information_form_skips_unretained_space_covariance():
+
+    modellers = dict()
+    for information in (False, True):
+        modeller = seeldlm.ModellerDLM(
+            build_prime_memory(features=30),
+            retention=seeldlm.RetentionDLM.means_only(),
+            information=information,
+        )
+        modeller.forward()
+        modellers[information] = modeller
+
+    # -- Woodbury terms replace the (M, M) covariance nobody keeps
+    _, evolved_space = modellers[True].memory.latest["evolved_spaces"]
+    assert evolved_space.covariance is None
+    assert evolved_space.woodbury is not None
+
+    assert numpy.allclose(
+        modellers[True].log_likelihoods(), modellers[False].log_likelihoods()
+    )
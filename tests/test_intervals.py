@@ -0,0 +1,41 @@
+import numpy
+from scipy import stats
+
+import seeldlm
+from seeldlm.containers import t_quantile, t_quantiles
+from tests.helpers import build_prime_memory
+
+
+def test_cached_quantiles_match_scipy():
+
+    shapes = numpy.array([[3.0, 7.5], [3.0, 120.0]])
+    t_quantile.cache_clear()
+
+    quantiles = t_quantiles(0.05, shapes)
+
+    assert numpy.allclose(quantiles, stats.t.ppf(0.975, shapes))
+    assert t_quantile.cache_info().misses == 3
+
+    t_quantiles(0.05, shapes)
+    assert t_quantile.cache_info().misses == 3
+
+
+def test_filtered_intervals_match_scipy():
+
+    modeller = seeldlm.ModellerDLM(build_prime_memory())
+    modeller.forward()
+    memory = modeller.get_memory()
+    S = memory.S
+
+    lower, upper = seeldlm.IntervalDLM(memory).filtered(0.1)
+
+    for time in (1, S // 2, S):
+        space = memory.filtered_spaces.get_from_time(time)
+        wishart = memory.wisharts.get_from_time(time)
+        scale = numpy.sqrt(
+            numpy.outer(space.covariance.diagonal(), wishart.scale.diagonal())
+            / wishart.shape
+        )
+        expected = stats.t.interval(0.9, wishart.shape, space.mean, scale)
+        assert numpy.allclose(lower[time - 1], expected[0])
+        assert numpy.allclose(upper[time - 1], expected[1])
@@ -0,0 +1,34 @@
+import numpy
+import pytest
+
+import seeldlm
+from tests.helpers import build_prime_memory
+
+
+@pytest.mark.parametrize("storage", ["dict", "tensor"])
+def test_diagonal_layout_only_serves_variances(storage):
+
+    dense = seeldlm.ModellerDLM(build_prime_memory(), storage=storage)
+    dense.forward()
+    diagonal = seeldlm.ModellerDLM(
+        build_prime_memory(), storage=storage, layout="diagonal"
+    )
+    diagonal.forward()
+
+    S = dense.prime_memory.S
+    spaces = diagonal.get_memory().filtered_spaces
+    reference = dense.get_memory().filtered_spaces
+
+    assert numpy.allclose(spaces.means(1, S + 1), reference.means(1, S + 1))
+    assert numpy.allclose(spaces.variances(1, S + 1), reference.variances(1, S + 1))
+    assert numpy.allclose(
+        spaces.covariance(1, S + 1, 0, 0), reference.covariance(1, S + 1, 0, 0)
+    )
+
+    for read in (
+        lambda: spaces.covariances(1, S + 1),
+        lambda: spaces.get_from_time(1),
+        lambda: list(spaces.generate_container(1, 3)),
+    ):
+        with pytest.raises(BaseException, match="Off-diagonal"):
+            read()
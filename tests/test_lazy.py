@@ -0,0 +1,42 @@
+import numpy
+import pytest
+
+import seeldlm
+from tests.helpers import build_prime_memory
+
+
+@pytest.mark.parametrize("storage", ["dict", "tensor"])
+def test_lazy_spaces_match_eager(storage):
+
+    modellers = dict()
+    for lazy_spaces in (False, True):
+        modeller = seeldlm.ModellerDLM(
+            build_prime_memory(), storage=storage, lazy_spaces=lazy_spaces
+        )
+        modeller.forward()
+        modeller.backward()
+        modeller.beyond()
+        modellers[lazy_spaces] = modeller
+
+    memory, expected = modellers[True].memory, modellers[False].memory
+    S, P = memory.S, memory.P
+
+    # -- Nothing is projected into observation space until it is read
+    for name in ("filtered_spaces", "smoothed_spaces", "predicted_spaces"):
+        assert len(getattr(memory, name).cache) == 0
+
+    ranges = {
+        "filtered_spaces": (1, S + 1),
+        "smoothed_spaces": (1, S + 1),
+        "predicted_spaces": (S, S + P + 1),
+    }
+    for name, (start, end) in ranges.items():
+        lazy, eager = getattr(memory, name), getattr(expected, name)
+        assert numpy.allclose(lazy.means(start, end), eager.means(start, end))
+        assert numpy.allclose(
+            lazy.covariances(start, end), eager.covariances(start, end)
+        )
+        assert numpy.allclose(
+            lazy.get_from_time(start + 1).mean, eager.get_from_time(start + 1).mean
+        )
+        assert len(lazy.cache) == end - start
@@ -0,0 +1,61 @@
+from typing import Dict
+import numpy
+import pytest
+
+import seeldlm
+import seeldlm.objects.utils
+from tests.helpers import build_prime_memory
+
+
+def counted(monkeypatch, module, name, counts):
+
+    function = getattr(module, name)
+
+    def wrapper(*args, **kwargs):
+        counts[name] = counts.get(name, 0) + 1
+        return function(*args, **kwargs)
+
+    monkeypatch.setattr(module, name, wrapper)
+
+
+@pytest.mark.parametrize("numerics", ["inverse", "cholesky"])
+def test_one_factorisation_per_covariance(monkeypatch, numerics):
+
+    counts: "Dict[str, int]" = dict()
+    counted(monkeypatch, seeldlm.objects.utils, "cholesky", counts)
+    counted(monkeypatch, numpy.linalg, "inv", counts)
+
+    modeller = seeldlm.ModellerDLM(build_prime_memory(), numerics=numerics)
+    modeller.forward()
+
+    # -- Evolved state, observation space and scale each factorise once a step
+    S = modeller.prime_memory.S
+    assert counts == {"cholesky": 3 * S + 1}
+
+
+def test_log_likelihood_matches_across_numerics():
+
+    inverse = seeldlm.ModellerDLM(build_prime_memory(), numerics="inverse")
+    inverse.forward()
+    cholesky = seeldlm.ModellerDLM(build_prime_memory(), numerics="cholesky")
+    cholesky.forward()
+
+    assert numpy.allclose(inverse.log_likelihoods(), cholesky.log_likelihoods())
+
+
+@pytest.mark.parametrize(
+    "factor_shape, array_shape",
+    [((4, 4), (5, 4, 3)), ((5, 4, 4), (4, 3)), ((2, 1, 4, 4), (3, 4, 3))],
+)
+@pytest.mark.parametrize("trans", [False, True])
+def test_lower_solve_broadcasts_batches(factor_shape, array_shape, trans):
+
+    generator = numpy.random.default_rng(0)
+    factor = numpy.tril(generator.normal(size=factor_shape)) + 4 * numpy.eye(4)
+    array = generator.normal(size=array_shape)
+
+    solved = seeldlm.objects.utils.lower_solve(factor, array, trans)
+    expected = numpy.linalg.solve(factor.swapaxes(-1, -2) if trans else factor, array)
+
+    assert solved.shape == expected.shape
+    assert numpy.allclose(solved, expected)
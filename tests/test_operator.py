@@ -0,0 +1,51 @@
+import numpy
+import pytest
+
+import seeldlm
+from seeldlm import components
+from seeldlm.objects.utils import transpose
+
+
+def mixed_compiler():
+
+    factory = seeldlm.ComponentFactory()
+    compiler = seeldlm.ModelCompiler(3)
+    compiler.add_component_sequence(
+        factory.polynomial(3, 0.9),
+        factory.harmonics(2, 4, 0.95),
+        factory.form_free(5, 0.7),
+        factory.regression(0, 3, numpy.arange(5.0)),
+        factory.autoregression(3, numpy.array([0.1, 0.2, 0.3])),
+        factory.polynomial(1),
+    )
+    compiler.set_vertex(-1, 0, [0])
+    compiler.set_vertex(-1, 1, [1, 2])
+    compiler.set_vertex(-1, 2, [0])
+    compiler.set_vertex(0, 3, [1])
+    compiler.set_vertex(2, 1, [0, 4])
+
+    return compiler
+
+
+@pytest.mark.parametrize("dense_size", [0, components.DENSE_OPERATOR_SIZE])
+@pytest.mark.parametrize("batch", [(), (2, 3)])
+def test_operator_products_match_dense(monkeypatch, dense_size, batch):
+
+    monkeypatch.setattr(components, "DENSE_OPERATOR_SIZE", dense_size)
+
+    rng = numpy.random.default_rng(0)
+    compiler = mixed_compiler()
+    pairs = [
+        (compiler.compile_transition(), compiler.compile_transition_operator()),
+        (compiler.compile_observation(), compiler.compile_observation_operator()),
+    ]
+
+    for dense, operator in pairs:
+        right = rng.random(batch + (dense.shape[1], 4))
+        left = rng.random(batch + (5, dense.shape[0]))
+        assert numpy.allclose(operator @ right, dense @ right)
+        assert numpy.allclose(left @ operator, left @ dense)
+        assert numpy.allclose(
+            right.swapaxes(-1, -2) @ transpose(operator),
+            right.swapaxes(-1, -2) @ dense.T,
+        )
@@ -0,0 +1,96 @@
+import numpy
+import pytest
+
+import seeldlm
+from tests.helpers import build_prime_memory
+
+PRESETS = ["full", "forward_only", "last_state_only", "means_only"]
+
+
+class Interrupt(Exception):
+    pass
+
+
+def build_modeller(preset, storage):
+    return seeldlm.ModellerDLM(
+        build_prime_memory(),
+        storage=storage,
+        retention=getattr(seeldlm.RetentionDLM, preset)(),
+    )
+
+
+@pytest.mark.parametrize("storage", ["dict", "tensor"])
+@pytest.mark.parametrize("preset", PRESETS)
+def test_presets_match_full_retention(preset, storage):
+
+    reference = build_modeller("full", storage)
+    reference.forward()
+
+    modeller = build_modeller(preset, storage)
+    modeller.forward()
+
+    S = reference.prime_memory.S
+    memory, expected = modeller.get_memory(), reference.get_memory()
+    assert numpy.allclose(modeller.log_likelihoods(), reference.log_likelihoods())
+    assert numpy.allclose(
+        memory.filtered_states.get_from_time(S).covariance,
+        expected.filtered_states.get_from_time(S).covariance,
+    )
+
+    retention = memory.retention
+    if retention.history:
+        assert numpy.allclose(
+            memory.filtered_states.means(0, S + 1),
+            expected.filtered_states.means(0, S + 1),
+        )
+    else:
+        assert memory.filtered_states.times() == [0, S]
+
+    if not retention.smoothers:
+        with pytest.raises(BaseException, match="retained smoothers"):
+            modeller.backward()
+        return
+
+    reference.backward()
+    modeller.backward()
+    assert numpy.allclose(
+        memory.smoothed_states.means(0, S + 1),
+        expected.smoothed_states.means(0, S + 1),
+    )
+
+
+@pytest.mark.parametrize("storage", ["dict", "tensor"])
+@pytest.mark.parametrize("preset", PRESETS)
+def test_presets_checkpoint_and_resume(tmp_path, preset, storage):
+
+    reference = build_modeller(preset, storage)
+    reference.forward()
+
+    def callback(time):
+        if time == 35:
+            raise Interrupt()
+
+    modeller = build_modeller(preset, storage)
+    with pytest.raises(Interrupt):
+        modeller.forward(
+            checkpoint_directory=str(tmp_path), checkpoint_every=10, callback=callback
+        )
+
+    restored = seeldlm.ModellerDLM.restore(str(tmp_path), storage=storage)
+    assert vars(restored.memory.retention) == vars(modeller.memory.retention)
+    assert restored.filtered_time() == 30
+
+    restored.forward(start=restored.filtered_time())
+
+    S = reference.prime_memory.S
+    memory, expected = restored.get_memory(), reference.get_memory()
+    assert numpy.allclose(restored.log_likelihoods(), reference.log_likelihoods())
+    assert numpy.allclose(
+        memory.filtered_states.get_from_time(S).mean,
+        expected.filtered_states.get_from_time(S).mean,
+    )
+    if memory.retention.history:
+        assert numpy.allclose(
+            memory.filtered_states.means(0, S + 1),
+            expected.filtered_states.means(0, S + 1),
+        )
@@ -0,0 +1,54 @@
+import numpy
+
+import seeldlm
+from seeldlm.sampler import SamplerDLM
+from tests.helpers import build_prime_memory
+
+DRAWS = 4000
+
+
+def test_sample_moments_match_smoothed_states():
+
+    modeller = seeldlm.ModellerDLM(build_prime_memory())
+    modeller.forward()
+    modeller.backward()
+    memory = modeller.get_memory()
+    S = memory.S
+
+    states, columns = SamplerDLM(memory, seed=1).sample(DRAWS)
+    assert states.shape[:2] == (DRAWS, S + 1)
+
+    # -- Marginally over the column covariance, cov(vec X) = C kron E[Sigma]
+    wishart = memory.wisharts.get_from_time(S)
+    N = wishart.scale.shape[-1]
+    expected_columns = wishart.scale / (wishart.shape - N - 1)
+    assert numpy.allclose(columns.mean(axis=0), expected_columns, rtol=0.05)
+
+    for time in (0, S // 2, S):
+        smoothed = memory.smoothed_states.get_from_time(time)
+        deviation = numpy.sqrt(
+            numpy.outer(smoothed.covariance.diagonal(), expected_columns.diagonal())
+        )
+        error = states[:, time].mean(axis=0) - smoothed.mean
+        assert (numpy.abs(error) < 4 * deviation / numpy.sqrt(DRAWS)).all()
+
+        for subject in range(N):
+            covariance = numpy.cov(states[:, time, :, subject], rowvar=False)
+            expected = smoothed.covariance * expected_columns[subject, subject]
+            assert (
+                numpy.abs(covariance - expected).max() < 0.1 * numpy.abs(expected).max()
+            )
+
+
+def test_samples_are_reproducible_per_stream():
+
+    modeller = seeldlm.ModellerDLM(build_prime_memory())
+    modeller.forward()
+    sampler = SamplerDLM(modeller.get_memory(), seed=3)
+
+    first, _ = sampler.sample(5, stream=2)
+    again, _ = sampler.sample(5, stream=2)
+    other, _ = sampler.sample(5, stream=3)
+
+    assert numpy.array_equal(first, again)
+    assert not numpy.allclose(first, other)
@@ -0,0 +1,46 @@
+import numpy
+import pytest
+
+import seeldlm
+from tests.helpers import build_prime_memory
+
+
+def build_scenarios():
+
+    modeller = seeldlm.ModellerDLM(build_prime_memory())
+    modeller.forward()
+    modeller.beyond()
+
+    return modeller, seeldlm.ScenarioDLM(
+        modeller.get_memory(), modeller.get_prime_memory(), seed=5
+    )
+
+
+@pytest.mark.parametrize("chunk", [1, 300, 512])
+def test_chunked_memmap_matches_unchunked(tmp_path, chunk):
+
+    _, scenarios = build_scenarios()
+    draws = 1000
+
+    unchunked = scenarios.generate(draws, chunk=draws)
+
+    path = str(tmp_path / "scenarios.npy")
+    chunked = scenarios.generate(draws, chunk=chunk, path=path)
+
+    assert isinstance(chunked, numpy.memmap)
+    assert numpy.array_equal(chunked, unchunked)
+    assert numpy.array_equal(numpy.load(path), unchunked)
+
+
+def test_scenario_means_match_predicted_spaces():
+
+    modeller, scenarios = build_scenarios()
+    memory = modeller.get_memory()
+    S, P = memory.S, memory.P
+
+    paths = scenarios.generate(4000)
+    predicted = memory.predicted_spaces.means(S + 1, S + P + 1)
+    spread = numpy.sqrt(memory.predicted_spaces.variances(S + 1, S + P + 1))
+
+    error = paths.mean(axis=0) - predicted
+    assert (numpy.abs(error) < 0.05 * spread[..., None]).all()
@@ -0,0 +1,80 @@
+import functools
+import numpy
+import pytest
+
+from seeldlm.search import SearchDLM
+from tests.helpers import build_prime_memory
+
+CANDIDATES = [dict(variance=variance) for variance in (1.0, 10.0, 100.0)]
+
+
+def builder(observations, variance=50.0, predicted_period=10):
+
+    prime_memory = build_prime_memory(
+        observed_period=observations.shape[-1] - predicted_period,
+        predicted_period=predicted_period,
+    )
+    prime_memory.observations = observations
+    observer = prime_memory.observers.get_from_time(0)
+    observer.covariance = observer.covariance / 50 * variance
+
+    return prime_memory
+
+
+def observations():
+    return build_prime_memory(observed_period=50).observations
+
+
+@pytest.mark.parametrize("score", ["likelihood", "forecast"])
+def test_journal_resume(tmp_path, score):
+
+    journal = str(tmp_path / "journal.jsonl")
+
+    first = SearchDLM(
+        builder, observations(), CANDIDATES[:2], score, journal, processes=1
+    )
+    first.run()
+
+    resumed = SearchDLM(
+        builder, observations(), CANDIDATES, score, journal, processes=1
+    )
+    assert resumed.pending() == [2]
+
+    table = resumed.run()
+    reference = SearchDLM(builder, observations(), CANDIDATES, score, processes=1).run()
+
+    assert [row["candidate"] for row in table] == [
+        row["candidate"] for row in reference
+    ]
+    for row, expected in zip(table, reference):
+        assert numpy.isclose(row[score], expected[score])
+    assert len(open(journal).readlines()) == 3
+
+
+def test_journal_rejects_other_score(tmp_path):
+
+    journal = str(tmp_path / "journal.jsonl")
+    SearchDLM(
+        builder, observations(), CANDIDATES[:1], journal=journal, processes=1
+    ).run()
+
+    with pytest.raises(BaseException, match="written with score likelihood"):
+        SearchDLM(builder, observations(), CANDIDATES, "forecast", journal, processes=1)
+
+
+def test_journal_keys_forecast_horizon(tmp_path):
+
+    journal = str(tmp_path / "journal.jsonl")
+    short = functools.partial(builder, predicted_period=5)
+    SearchDLM(short, observations(), CANDIDATES, "forecast", journal, 1).run()
+
+    search = SearchDLM(builder, observations(), CANDIDATES, "forecast", journal, 1)
+    assert search.pending() == [0, 1, 2]
+
+
+def test_forecast_requires_observations_beyond_S():
+
+    with pytest.raises(BaseException, match="observations beyond S"):
+        SearchDLM(
+            builder, observations(), [dict(predicted_period=0)], "forecast", processes=1
+        )
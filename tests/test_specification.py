@@ -0,0 +1,39 @@
+import numpy
+
+from seeldlm.specification import ModelCache, ModelSpecification
+
+
+def specification(period, discount):
+    return (
+        ModelSpecification(1)
+        .add_component("polynomial", 2)
+        .add_component("harmonics", period, 2, discount)
+        .set_vertex(-1, 0, [0])
+        .set_vertex(-1, 1, [0])
+    )
+
+
+def test_equal_numbers_share_a_digest():
+
+    digests = {
+        specification(period, discount).digest()
+        for period, discount in [(12, 1), (12.0, 1.0), (numpy.int64(12), 1)]
+    }
+    assert len(digests) == 1
+    assert specification(12, 0.5).digest() != specification(12, 1).digest()
+
+
+def test_disk_cache_round_trip(tmp_path):
+
+    cache = ModelCache(directory=str(tmp_path))
+    model = cache.get(specification(12, 1))
+
+    assert [path.name for path in tmp_path.iterdir()] == [
+        f"{specification(12.0, 1.0).digest()}.npz"
+    ]
+
+    reloaded = ModelCache(directory=str(tmp_path)).get(specification(12.0, 1.0))
+    assert numpy.array_equal(reloaded.transition, model.transition)
+    assert numpy.array_equal(
+        reloaded.transition_operator.toarray(), model.transition_operator.toarray()
+    )
@@ -0,0 +1,40 @@
+import numpy
+
+import seeldlm
+from seeldlm.containers import TensorStore
+from tests.helpers import build_prime_memory
+
+
+def test_store_promotes_wider_values():
+
+    store = TensorStore(0, 3)
+    store.write(0, mean=numpy.array([1, 2]))
+    store.write(1, mean=numpy.array([0.5, 1.5]))
+
+    assert store.tensors["mean"].dtype == numpy.float64
+    assert numpy.array_equal(store.slice("mean", 0, 2), [[1, 2], [0.5, 1.5]])
+
+
+def test_integer_primordial_model_matches_dict_storage():
+
+    modellers = dict()
+    for storage in ("dict", "tensor"):
+        prime_memory = build_prime_memory()
+        P, N = prime_memory.primordial_model.mean.shape
+        prime_memory.primordial_model = seeldlm.NormalModel(
+            numpy.zeros((P, N), dtype=int), 10 * numpy.eye(P, dtype=int)
+        )
+        modellers[storage] = seeldlm.ModellerDLM(prime_memory, storage=storage)
+        modellers[storage].forward()
+        modellers[storage].backward()
+
+    S = modellers["dict"].prime_memory.S
+    memory, expected = modellers["tensor"].memory, modellers["dict"].memory
+    for name in ("filtered_states", "smoothed_states"):
+        means = getattr(memory, name).means(0, S + 1)
+        assert means.dtype == numpy.float64
+        assert numpy.allclose(means, getattr(expected, name).means(0, S + 1))
+    assert numpy.allclose(
+        memory.filtered_states.covariances(0, S + 1),
+        expected.filtered_states.covariances(0, S + 1),
+    )
@@ -0,0 +1,60 @@
+import numpy
+import pytest
+
+import seeldlm
+from seeldlm.stream import StreamDLM, FixedLagDLM
+from tests.helpers import build_prime_memory
+
+
+def stream_arguments(prime_memory):
+    return (
+        prime_memory.primordial_model,
+        prime_memory.primordial_error,
+        prime_memory.evolvers.get_from_time(0),
+        prime_memory.observers.get_from_time(0),
+    )
+
+
+@pytest.mark.parametrize("information", [False, True])
+@pytest.mark.parametrize("steady_tolerance", [None, 1e-9])
+def test_stream_matches_forward(information, steady_tolerance):
+
+    prime_memory = build_prime_memory()
+    modeller = seeldlm.ModellerDLM(
+        prime_memory, steady_tolerance=steady_tolerance, information=information
+    )
+    modeller.forward()
+
+    stream = StreamDLM(
+        *stream_arguments(prime_memory),
+        steady_tolerance=steady_tolerance,
+        information=information,
+    )
+    log_likelihoods = [
+        stream.step(prime_memory.observations[..., time]).log_likelihood
+        for time in range(prime_memory.S)
+    ]
+
+    S = prime_memory.S
+    assert numpy.allclose(log_likelihoods, modeller.log_likelihoods())
+    assert numpy.allclose(
+        stream.filtered_state.mean, modeller.memory.filtered_states.means(S, S + 1)[0]
+    )
+
+
+def test_fixed_lag_matches_full_smoother():
+
+    prime_memory = build_prime_memory()
+    modeller = seeldlm.ModellerDLM(prime_memory)
+    modeller.forward()
+    modeller.backward()
+
+    lag = 5
+    stream = FixedLagDLM(*stream_arguments(prime_memory), lag=lag)
+    for time in range(prime_memory.S):
+        stream.step(prime_memory.observations[..., time])
+
+    # -- At the end of the data the lagged estimate is the full smoother
+    smoothed = modeller.memory.smoothed_states.get_from_time(stream.lagged_time())
+    assert numpy.allclose(stream.lagged_state.mean, smoothed.mean)
+    assert numpy.allclose(stream.lagged_state.covariance, smoothed.covariance)